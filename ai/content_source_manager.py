@@ -4,19 +4,90 @@ Content Source Manager
 Coordinates RSS feeds, Twitter API reads, and web scraper for optimal content discovery
 """
 
+import hashlib
 import logging
 import random
+import re
+import threading
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from itertools import accumulate
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from urllib.parse import urlsplit
 from enum import Enum
+from integrations.twitter_api import TweetRow
 
 logger = logging.getLogger(__name__)
 
+# Strategic search terms for viral reply discovery
+_VIRAL_SEARCH_TERMS = (
+    "AI startup", "SaaS growth", "product launch", "funding round", 
+    "viral", "breaking", "milestone", "achievement"
+)
+
+# Viral search yield tracking, used to avoid spending API reads on searches that keep coming up empty
+_VIRAL_SCORE_THRESHOLD = 8.0
+_VIRAL_HISTORY_SIZE = 50        # recent searches whose best score is remembered
+_VIRAL_MIN_HISTORY = 10         # searches needed before the hit rate is trusted
+_VIRAL_MIN_HIT_RATE = 0.1       # below this, most cycles skip the search
+_VIRAL_MAX_SKIPPED_SEARCHES = 3 # ...but every few cycles still probe so the rate can recover
+
+# Keyword sets for enhanced viral scoring
+_AUTHORITATIVE_DOMAINS = frozenset(('techcrunch.com', 'theverge.com', 'wired.com', 'reuters.com'))
+# Subdomains (www., edition. ...) match via the dot-prefixed suffixes; bare suffixes would
+# also accept look-alikes such as "notwired.com"
+_AUTHORITATIVE_SUFFIXES = tuple('.' + domain for domain in _AUTHORITATIVE_DOMAINS)
+# Compiled into one alternation so the text is scanned once instead of once per keyword
+_TIME_INDICATOR_RE = re.compile("|".join(
+    re.escape(indicator) for indicator in ('today', 'breaking', 'just announced', 'latest')
+))
+_TREND_CACHE_TTL_SECONDS = 300
+
+_BOOSTED_CATEGORIES = frozenset(('ai_breakthrough', 'startup_funding'))
+
+# ASCII lowercase table applied to encoded bytes when fingerprinting content
+_LOWER_TABLE = bytes.maketrans(bytes(range(65, 91)), bytes(range(97, 123)))
+
 class ContentSource(Enum):
     RSS_INSPIRATION = "rss_inspiration"
     API_VIRAL_REPLY = "api_viral_reply"  
     WEB_SCRAPER_TRENDING = "web_scraper_trending"
 
+# Module-level aliases so hot paths skip the enum attribute lookup
+_RSS = ContentSource.RSS_INSPIRATION
+_API = ContentSource.API_VIRAL_REPLY
+_WEB = ContentSource.WEB_SCRAPER_TRENDING
+
+@dataclass(slots=True)
+class ContentResult:
+    """Outcome of a content discovery lookup; unset fields don't apply to its source"""
+    success: bool
+    source: ContentSource
+    action_type: Optional[str] = None
+    error: Optional[str] = None
+    # RSS reply
+    opportunity: Optional[Dict[str, Any]] = None
+    target_user: Optional[str] = None
+    # Web scraper trending post
+    trend_topic: Optional[str] = None
+    trend_context: Optional[str] = None
+    viral_potential: Any = None
+    # API viral reply
+    viral_tweet: Optional[Dict[str, Any]] = None
+    search_term: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields that are set, for JSON output"""
+        return {f.name: getattr(self, f.name) for f in fields(self) if getattr(self, f.name) is not None}
+
+def _fail(source: ContentSource, error: str) -> ContentResult:
+    """Failed lookup result for a source"""
+    return ContentResult(False, source, error=error)
+
 class ContentSourceManager:
     """Manages and balances all content discovery sources"""
     
@@ -31,17 +102,35 @@ class ContentSourceManager:
         # Optimal content distribution strategy (CORRECTED)
         self.content_distribution = {
             'posts': {
-                ContentSource.WEB_SCRAPER_TRENDING: 1.0   # 100% web scraper for standalone posts
+                _WEB: 1.0   # 100% web scraper for standalone posts
             },
             'engagements': {
-                ContentSource.RSS_INSPIRATION: 0.70,      # 70% RSS feeds for reply discovery
-                ContentSource.API_VIRAL_REPLY: 0.30       # 30% Twitter API viral reply discovery
+                _RSS: 0.70,      # 70% RSS feeds for reply discovery
+                _API: 0.30       # 30% Twitter API viral reply discovery
             }
         }
         
+        # Engagement dispatch table: one lookup method per source, weighted by the distribution
+        engagement_handlers = {
+            _RSS: self._get_rss_reply_opportunity,
+            _API: self._get_viral_reply_engagement
+        }
+        engagement_weights = self.content_distribution['engagements']
+        self._engagement_sources = [engagement_handlers[source] for source in engagement_weights]
+        self._engagement_cum_weights = list(accumulate(engagement_weights.values()))
+        
+        # Trend analysis is expensive (web scraping + AI); reuse it for a few minutes
+        self._trend_cache: Optional[tuple] = None  # (monotonic time, trends)
+        self._trend_lock = threading.Lock()
+        
+        # Viral search yield: best score of recent searches, and per-term [hits, searches]
+        self._recent_viral_scores = deque(maxlen=_VIRAL_HISTORY_SIZE)
+        self._viral_term_stats = {term: [0, 0] for term in _VIRAL_SEARCH_TERMS}
+        self._skipped_viral_searches = 0
+        
         logger.info("🎯 Content Source Manager initialized with optimal strategy")
     
-    def get_content_for_posting(self, content_type: str = "post") -> Dict[str, Any]:
+    def get_content_for_posting(self, content_type: str = "post") -> ContentResult:
         """Get content for posting using optimal source distribution"""
         
         if content_type == "post":
@@ -51,101 +140,113 @@ class ContentSourceManager:
         else:
             raise ValueError(f"Unknown content type: {content_type}")
     
-    def _get_post_content(self) -> Dict[str, Any]:
+    def _get_post_content(self) -> ContentResult:
         """Get content for standalone posts (100% web scraper trending topics)"""
         
         # Always use web scraper for standalone posts
         return self._get_web_scraper_post()
     
-    def _get_engagement_content(self) -> Dict[str, Any]:
+    def _get_engagement_content(self) -> ContentResult:
         """Get content for engagements/replies (RSS + API viral discovery)"""
         
-        # Determine source based on distribution  
-        rand = random.random()
-        
-        if rand < self.content_distribution['engagements'][ContentSource.RSS_INSPIRATION]:
-            return self._get_rss_reply_opportunity()
-        else:
-            return self._get_viral_reply_engagement()
+        # Determine source based on distribution
+        lookup = random.choices(self._engagement_sources, cum_weights=self._engagement_cum_weights)[0]
+        return lookup()
     
-    def _get_rss_reply_opportunity(self) -> Dict[str, Any]:
+    def _get_rss_reply_opportunity(self) -> ContentResult:
         """Find RSS posts to reply to (not for standalone content inspiration)"""
         try:
             opportunities = self.rss_engagement.discover_engagement_opportunities(max_opportunities=5)
+            used_posts = self.content_tracker.has_used_rss_posts(
+                [(opp['source_username'], opp['content']) for opp in opportunities]
+            )
             
-            # Filter out used content  
-            fresh_opportunities = [
-                opp for opp in opportunities 
-                if not self.content_tracker.has_used_rss_post(opp['source_username'], opp['content'])
-            ]
-            
-            if not fresh_opportunities:
-                return {'success': False, 'error': 'No fresh RSS opportunities', 'source': ContentSource.RSS_INSPIRATION}
-            
-            # Select best opportunity for reply
-            opportunity = max(fresh_opportunities, key=lambda x: x['engagement_score'])
-            
-            return {
-                'success': True,
-                'source': ContentSource.RSS_INSPIRATION,
-                'opportunity': opportunity,
-                'action_type': 'rss_reply',  # Reply to RSS content, not standalone post
-                'target_user': opportunity['source_username']
-            }
+            # Select best opportunity for reply, skipping used content, in a single pass
+            opportunity = None
+            best_score = None
+            for opp in opportunities:
+                if (opp['source_username'], opp['content']) in used_posts:
+                    continue
+                score = opp['engagement_score']
+                if opportunity is None or score > best_score:
+                    opportunity, best_score = opp, score
+            
+            if opportunity is None:
+                return _fail(_RSS, 'No fresh RSS opportunities')
+            
+            return ContentResult(
+                True,
+                _RSS,
+                action_type='rss_reply',  # Reply to RSS content, not standalone post
+                opportunity=opportunity,
+                target_user=opportunity['source_username']
+            )
             
         except Exception as e:
             logger.error(f"RSS reply discovery failed: {e}")
-            return {'success': False, 'error': str(e), 'source': ContentSource.RSS_INSPIRATION}
+            return _fail(_RSS, str(e))
     
-    def _get_web_scraper_post(self) -> Dict[str, Any]:
+    def _get_web_scraper_post(self) -> ContentResult:
         """Generate web scraper trending post"""
         try:
             # Analyze current trends
-            trends = self.trend_analyzer.analyze_current_trends()
+            trends = self._get_current_trends()
             
             if not trends or not trends.get('ai_analysis'):
-                return {'success': False, 'error': 'No trending topics found', 'source': ContentSource.WEB_SCRAPER_TRENDING}
+                return _fail(_WEB, 'No trending topics found')
             
             # Get top trending opportunity
             top_opportunities = trends['ai_analysis'].get('top_opportunities', [])
             if not top_opportunities:
-                return {'success': False, 'error': 'No trending opportunities', 'source': ContentSource.WEB_SCRAPER_TRENDING}
+                return _fail(_WEB, 'No trending opportunities')
             
             top_trend = top_opportunities[0]
             
-            return {
-                'success': True,
-                'source': ContentSource.WEB_SCRAPER_TRENDING,
-                'trend_topic': top_trend.get('trend_topic'),
-                'trend_context': top_trend.get('context'),
-                'action_type': 'trending_post',
-                'viral_potential': top_trend.get('viral_potential', 'medium')
-            }
+            return ContentResult(
+                True,
+                _WEB,
+                action_type='trending_post',
+                trend_topic=top_trend.get('trend_topic'),
+                trend_context=top_trend.get('context'),
+                viral_potential=top_trend.get('viral_potential', 'medium')
+            )
             
         except Exception as e:
             logger.error(f"Web scraper trending failed: {e}")
-            return {'success': False, 'error': str(e), 'source': ContentSource.WEB_SCRAPER_TRENDING}
+            return _fail(_WEB, str(e))
+    
+    def _get_current_trends(self) -> Dict[str, Any]:
+        """Return current trend analysis, cached for _TREND_CACHE_TTL_SECONDS"""
+        with self._trend_lock:
+            cached = self._trend_cache
+            if cached is not None and time.monotonic() - cached[0] < _TREND_CACHE_TTL_SECONDS:
+                return cached[1]
+            
+            trends = self.trend_analyzer.analyze_current_trends()
+            # Only keep usable results so an empty analysis is retried next time
+            if trends:
+                self._trend_cache = (time.monotonic(), trends)
+            return trends
     
-    def _get_rss_inspired_engagement(self) -> Dict[str, Any]:
+    def _get_rss_inspired_engagement(self) -> ContentResult:
         """Generate RSS-inspired engagement (DEPRECATED - use _get_rss_reply_opportunity)"""
         return self._get_rss_reply_opportunity()
     
-    def _get_viral_reply_engagement(self) -> Dict[str, Any]:
+    def _get_viral_reply_engagement(self) -> ContentResult:
         """Find viral posts for direct replies using Twitter API"""
         try:
             # Check if we can use precious API reads
             if not self.api_tracker.can_read():
                 logger.warning("⚠️ Cannot use API reads - limit reached")
-                return {'success': False, 'error': 'API read limit reached', 'source': ContentSource.API_VIRAL_REPLY}
+                return _fail(_API, 'API read limit reached')
             
-            # Search for viral posts using strategic terms
-            viral_search_terms = [
-                "AI startup", "SaaS growth", "product launch", "funding round", 
-                "viral", "breaking", "milestone", "achievement"
-            ]
+            # Save the read when recent searches rarely surfaced a viral post
+            if self._should_skip_viral_search():
+                logger.info("⏭️ Recent viral searches found little - saving API read this cycle")
+                return _fail(_API, 'Low recent viral hit rate')
             
-            # Select one term strategically
-            search_term = random.choice(viral_search_terms)
+            # Select one strategic search term, favouring terms that have paid off
+            search_term = self._choose_viral_search_term()
             
             logger.info(f"🔍 Searching for viral posts with term: '{search_term}'")
             
@@ -159,78 +260,115 @@ class ContentSourceManager:
             # Track the API read
             self.api_tracker.record_read()
             
-            # Filter for truly viral posts
-            viral_tweets = []
-            for tweet in tweets:
-                # Check if we've already replied to this tweet
-                if self.content_tracker.has_replied_to_tweet(tweet['id']):
-                    continue
-                
-                # Score viral potential
-                engagement_score = self._calculate_viral_score(tweet)
-                
-                if engagement_score > 8.0:  # High viral threshold
-                    viral_tweets.append({
-                        'tweet_id': tweet['id'],
-                        'author': tweet['author']['username'],
-                        'content': tweet['text'],
-                        'engagement_score': engagement_score,
-                        'likes': tweet.get('public_metrics', {}).get('like_count', 0),
-                        'retweets': tweet.get('public_metrics', {}).get('retweet_count', 0),
-                        'replies': tweet.get('public_metrics', {}).get('reply_count', 0),
-                        'created_at': tweet.get('created_at')
-                    })
-            
-            if not viral_tweets:
-                return {'success': False, 'error': 'No viral posts found', 'source': ContentSource.API_VIRAL_REPLY}
-            
-            # Select the most viral post
-            best_viral_tweet = max(viral_tweets, key=lambda x: x['engagement_score'])
-            
-            return {
-                'success': True,
-                'source': ContentSource.API_VIRAL_REPLY,
-                'viral_tweet': best_viral_tweet,
-                'action_type': 'direct_viral_reply',
-                'search_term': search_term
+            # Skip tweets we've already replied to, then score the rest in one batch
+            replied = self.content_tracker.has_replied_to_tweets([tweet.id for tweet in tweets])
+            candidates = [tweet for tweet in tweets if tweet.id not in replied]
+            scores = self._calculate_viral_scores(candidates)
+            top_score = float(scores.max()) if candidates else 0.0
+            self._record_viral_search(search_term, top_score)
+            
+            # Select the most viral post above the high viral threshold
+            if top_score <= _VIRAL_SCORE_THRESHOLD:
+                return _fail(_API, 'No viral posts found')
+            
+            best = int(scores.argmax())
+            tweet = candidates[best]
+            best_viral_tweet = {
+                'tweet_id': tweet.id,
+                'author': tweet.author_username,
+                'content': tweet.text,
+                'engagement_score': float(scores[best]),
+                'likes': tweet.public_metrics.get('like_count', 0),
+                'retweets': tweet.public_metrics.get('retweet_count', 0),
+                'replies': tweet.public_metrics.get('reply_count', 0),
+                'created_at': tweet.created_at
             }
             
+            return ContentResult(
+                True,
+                _API,
+                action_type='direct_viral_reply',
+                viral_tweet=best_viral_tweet,
+                search_term=search_term
+            )
+            
         except Exception as e:
             logger.error(f"Viral reply discovery failed: {e}")
-            return {'success': False, 'error': str(e), 'source': ContentSource.API_VIRAL_REPLY}
+            return _fail(_API, str(e))
     
-    def _calculate_viral_score(self, tweet: Dict[str, Any]) -> float:
-        """Calculate viral potential score for a tweet"""
-        metrics = tweet.get('public_metrics', {})
+    def _should_skip_viral_search(self) -> bool:
+        """Skip most searches while the recent viral hit rate is low, probing periodically"""
+        recent = self._recent_viral_scores
+        if len(recent) < _VIRAL_MIN_HISTORY:
+            return False
         
-        likes = metrics.get('like_count', 0)
-        retweets = metrics.get('retweet_count', 0)
-        replies = metrics.get('reply_count', 0)
+        hit_rate = sum(1 for score in recent if score > _VIRAL_SCORE_THRESHOLD) / len(recent)
+        if hit_rate >= _VIRAL_MIN_HIT_RATE or self._skipped_viral_searches >= _VIRAL_MAX_SKIPPED_SEARCHES:
+            self._skipped_viral_searches = 0
+            return False
         
-        # Weighted scoring for viral potential
-        score = (likes * 0.4) + (retweets * 1.0) + (replies * 0.6)
+        self._skipped_viral_searches += 1
+        return True
+    
+    def _choose_viral_search_term(self) -> str:
+        """Pick a search term weighted by its smoothed historical hit rate"""
+        weights = [(hits + 1) / (searches + 2) for hits, searches in self._viral_term_stats.values()]
+        return random.choices(_VIRAL_SEARCH_TERMS, weights=weights, k=1)[0]
+    
+    def _record_viral_search(self, search_term: str, top_score: float) -> None:
+        """Remember how a search paid off for hit-rate tracking"""
+        self._recent_viral_scores.append(top_score)
+        stats = self._viral_term_stats[search_term]
+        stats[0] += top_score > _VIRAL_SCORE_THRESHOLD
+        stats[1] += 1
+    
+    def _calculate_viral_scores(self, tweets: List[TweetRow]) -> np.ndarray:
+        """Calculate viral potential scores for a batch of tweets"""
+        count = len(tweets)
+        likes = np.fromiter((t.public_metrics.get('like_count', 0) for t in tweets), dtype=np.float64, count=count)
+        retweets = np.fromiter((t.public_metrics.get('retweet_count', 0) for t in tweets), dtype=np.float64, count=count)
+        replies = np.fromiter((t.public_metrics.get('reply_count', 0) for t in tweets), dtype=np.float64, count=count)
+        
+        # Weighted scoring for viral potential, normalized to 0-10 scale
+        scores = np.minimum((likes * 0.4 + retweets + replies * 0.6) / 100, 10.0)
         
-        # Normalize to 0-10 scale
-        normalized_score = min(score / 100, 10.0)
+        # Boost for recency (API timestamps are UTC; unparseable ones become NaT and get no boost)
+        created = self._utc_datetime64s([t.created_at for t in tweets])
+        hours_old = (np.datetime64('now', 's') - created) / np.timedelta64(1, 'h')
+        scores[hours_old < 24] *= 1.2  # Recent posts get boost
         
-        # Boost for recency
+        return np.minimum(scores, 10.0)
+    
+    @staticmethod
+    def _utc_datetime64s(timestamps: List[Optional[str]]) -> np.ndarray:
+        """Parse ISO-8601 UTC timestamps into naive datetime64[s] (NaT when missing/invalid)"""
+        # Keep the "YYYY-MM-DDTHH:MM:SS" prefix, dropping fractions and the UTC suffix;
+        # missing or misshapen values go straight to NaT rather than through a parse error
+        stamps = [
+            timestamp[:19] if timestamp and len(timestamp) >= 19 and timestamp[10] in 'T ' else 'NaT'
+            for timestamp in timestamps
+        ]
         try:
-            created_at = datetime.fromisoformat(tweet.get('created_at', '').replace('Z', '+00:00'))
-            hours_old = (datetime.now() - created_at).total_seconds() / 3600
-            
-            if hours_old < 24:  # Recent posts get boost
-                normalized_score *= 1.2
-        except:
+            # Fast path: the whole column in one C-level conversion
+            return np.array(stamps, dtype='datetime64[s]')
+        except ValueError:
             pass
         
-        return min(normalized_score, 10.0)
+        # A well-shaped entry still failed to parse (e.g. month 13); go row by row
+        # so only that one becomes NaT
+        parsed = []
+        for stamp in stamps:
+            try:
+                parsed.append(np.datetime64(stamp, 's'))
+            except ValueError:
+                parsed.append(np.datetime64('NaT'))
+        return np.array(parsed, dtype='datetime64[s]')
     
     def _calculate_enhanced_viral_score(self, content: Dict[str, Any]) -> float:
         """Enhanced viral score calculation with multiple factors"""
         
         try:
             score = 0.0
-            title = content.get('title', '').lower()
             text_content = content.get('content', '').lower()
             url = content.get('url', '')
             
@@ -247,18 +385,17 @@ class ContentSourceManager:
             score += min(engagement_likelihood * 0.2, 2)
             
             # Domain authority boost
-            authoritative_domains = ['techcrunch.com', 'theverge.com', 'wired.com', 'reuters.com']
-            if any(domain in url for domain in authoritative_domains):
+            host = self._extract_domain(url).lower()
+            if host in _AUTHORITATIVE_DOMAINS or host.endswith(_AUTHORITATIVE_SUFFIXES):
                 score += 1.5
             
             # Content category boost
             content_category = content.get('content_category', {})
-            if content_category.get('primary') in ['ai_breakthrough', 'startup_funding']:
+            if content_category.get('primary') in _BOOSTED_CATEGORIES:
                 score += 1.0
             
-            # Time relevance
-            time_indicators = ['today', 'breaking', 'just announced', 'latest']
-            time_matches = sum(1 for indicator in time_indicators if indicator in text_content)
+            # Time relevance (distinct indicators present)
+            time_matches = len(set(_TIME_INDICATOR_RE.findall(text_content)))
             score += min(time_matches * 0.5, 1)
             
             return min(score, 10.0)
@@ -268,23 +405,25 @@ class ContentSourceManager:
     
     def _generate_content_hash(self, content: Dict[str, Any]) -> str:
         """Generate hash for content deduplication"""
-        import hashlib
-        
-        title = content.get('title', '')
-        url = content.get('url', '')
-        content_text = content.get('content', '')[:100]  # First 100 chars
-        
-        combined = f"{title}{url}{content_text}".lower()
-        return hashlib.md5(combined.encode()).hexdigest()[:12]
+        # Stream fields into the hasher instead of concatenating them first
+        hasher = hashlib.blake2b(digest_size=6)
+        hasher.update(content.get('title', '').encode().translate(_LOWER_TABLE))
+        hasher.update(content.get('url', '').encode())
+        hasher.update(content.get('content', '')[:100].encode().translate(_LOWER_TABLE))  # First 100 chars
+        return hasher.hexdigest()
     
-    def _extract_domain(self, url: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _extract_domain(url: str) -> str:
         """Extract domain from URL"""
+        if not url:
+            return 'unknown'
         try:
-            if '//' in url:
-                return url.split('/')[2]
-            return url.split('/')[0] if '/' in url else url
-        except:
+            parts = urlsplit(url)
+        except (TypeError, ValueError):
             return 'unknown'
+        # Scheme-less URLs ("example.com/path") keep their host in the path
+        return parts.netloc or parts.path.split('/', 1)[0] or 'unknown'
     
     def get_content_for_email(self, count: int = 3) -> Dict[str, Any]:
         """Get diverse content suggestions for email from all sources"""
@@ -297,24 +436,30 @@ class ContentSourceManager:
         }
         
         try:
-            # Get RSS reply opportunities  
-            rss_result = self._get_rss_reply_opportunity()
-            if rss_result['success']:
-                email_content['rss_inspired'].append(rss_result)
+            # Query all sources concurrently; each one is network-bound
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                # RSS reply opportunities
+                rss_future = executor.submit(self._get_rss_reply_opportunity)
+                # Trending topics from web scraper for standalone posts
+                web_future = executor.submit(self._get_web_scraper_post)
+                # Viral opportunities (only if we have API reads available)
+                viral_future = executor.submit(self._get_viral_reply_engagement) if self.api_tracker.can_read() else None
+                
+                rss_result = rss_future.result()
+                web_result = web_future.result()
+                viral_result = viral_future.result() if viral_future else None
+            
+            if rss_result.success:
+                email_content['rss_inspired'].append(rss_result.to_dict())
                 email_content['sources_used'].append('RSS feeds (reply opportunities)')
             
-            # Get trending topics from web scraper for standalone posts
-            web_result = self._get_web_scraper_post()
-            if web_result['success']:
-                email_content['trending_topics'].append(web_result)
+            if web_result.success:
+                email_content['trending_topics'].append(web_result.to_dict())
                 email_content['sources_used'].append('Web scraper (standalone posts)')
             
-            # Get viral opportunities (only if we have API reads available)
-            if self.api_tracker.can_read():
-                viral_result = self._get_viral_reply_engagement()
-                if viral_result['success']:
-                    email_content['viral_opportunities'].append(viral_result)
-                    email_content['sources_used'].append('Twitter API (viral replies)')
+            if viral_result and viral_result.success:
+                email_content['viral_opportunities'].append(viral_result.to_dict())
+                email_content['sources_used'].append('Twitter API (viral replies)')
             
             return email_content
             
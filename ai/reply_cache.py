@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Contextual Reply Cache
+Reuses generated replies for near-duplicate tweets using cosine similarity
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+logger = logging.getLogger(__name__)
+
+class ReplyCache:
+    """Semantic-similarity cache of contextual replies keyed by tweet text"""
+    
+    def __init__(self, similarity_threshold: float = 0.92, max_entries: int = 200, max_age_hours: float = 24):
+        """Initialize reply cache"""
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_hours * 3600
+        
+        # Parallel lists of cached tweet texts and (reply, stored_at) entries, oldest first
+        self._tweets: List[str] = []
+        self._entries: List[tuple] = []
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+    
+    def _evict_stale(self, now: float):
+        """Drop entries older than the maximum age"""
+        cutoff = now - self.max_age_seconds
+        stale = 0
+        while stale < len(self._entries) and self._entries[stale][1] < cutoff:
+            stale += 1
+        if stale:
+            del self._tweets[:stale]
+            del self._entries[:stale]
+    
+    def lookup(self, tweet_text: str) -> Optional[Dict[str, Any]]:
+        """Return the cached reply for the most similar tweet, if similar enough"""
+        with self._lock:
+            self._evict_stale(time.time())
+            if not tweet_text or not self._tweets:
+                self.misses += 1
+                return None
+            
+            try:
+                tfidf_matrix = TfidfVectorizer(lowercase=True).fit_transform([tweet_text] + self._tweets)
+                similarities = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:])[0]
+            except ValueError:
+                # Empty vocabulary (e.g. only punctuation or emoji)
+                self.misses += 1
+                return None
+            
+            best = int(similarities.argmax())
+            if similarities[best] >= self.similarity_threshold:
+                self.hits += 1
+                logger.debug(f"♻️ Reusing cached reply (similarity {similarities[best]:.3f})")
+                return self._entries[best][0]
+            
+            self.misses += 1
+            return None
+    
+    def store(self, tweet_text: str, reply: Dict[str, Any]):
+        """Cache a generated reply for a tweet"""
+        if not tweet_text:
+            return
+        with self._lock:
+            self._tweets.append(tweet_text)
+            self._entries.append((reply, time.time()))
+            if len(self._tweets) > self.max_entries:
+                del self._tweets[0]
+                del self._entries[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            'entries': len(self._tweets),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -5,23 +5,61 @@ Secure, type-safe configuration with environment detection
 """
 
 import os
-import yaml
+import re
+import threading
 from typing import Dict, Any, Optional, Union
 from dataclasses import dataclass, field
-from pathlib import Path
-from dotenv import load_dotenv
+from functools import lru_cache
 import logging
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+# Parsed YAML configs keyed by (path, mtime_ns, size) so repeated Config()
+# constructions skip re-parsing an unchanged file
+_YAML_CACHE: Dict[tuple, Dict[str, Any]] = {}
+
+# Parsed .env files keyed by (path, mtime_ns, size)
+_ENV_CACHE: Dict[tuple, Dict[str, str]] = {}
+
+# dotenv syntax the fast parser does not handle (export prefixes, ${VAR}
+# expansion, escapes, inline comments, multi-line quoted values); files
+# containing any of it are handed to python-dotenv instead
+_COMPLEX_DOTENV = re.compile(
+    r"^[ \t]*export[ \t]|\$\{|\\|[ \t]#|^[^#=\n]*=[ \t]*(['\"])(?:(?!\1).)*$",
+    re.MULTILINE,
+)
+
+# Environment variables consulted while building Config; only these are copied
+# out of os.environ into the merged lookup table
+_KNOWN_KEYS = frozenset({
+    "TWITTER_API_KEY", "TWITTER_API_SECRET", "TWITTER_ACCESS_TOKEN",
+    "TWITTER_ACCESS_TOKEN_SECRET", "TWITTER_BEARER_TOKEN",
+    "TWITTER_OAUTH_CLIENT_ID", "TWITTER_OAUTH_CLIENT_SECRET",
+    "TWITTER_OAUTH_ACCESS_TOKEN", "TWITTER_OAUTH_REFRESH_TOKEN", "TWITTER_OAUTH_USER_ID",
+    "TWITTER_POST_RETRY_ATTEMPTS",
+    "AI_PROVIDER",
+    "GEMINI_API_KEY", "GEMINI_MODEL", "GEMINI_TEMPERATURE", "GEMINI_TOP_P",
+    "GEMINI_TOP_K", "GEMINI_MAX_TOKENS",
+    "CLAUDE_API_KEY", "CLAUDE_MODEL", "CLAUDE_TEMPERATURE", "CLAUDE_MAX_TOKENS",
+    "OPENAI_API_KEY", "OPENAI_MODEL", "OPENAI_TEMPERATURE", "OPENAI_MAX_TOKENS",
+    "SMTP_HOST", "SMTP_PORT", "SMTP_SECURE", "SMTP_USER", "SMTP_PASSWORD",
+    "SMTP_FROM", "TO_EMAIL",
+    "SEARXNG_URL", "SEARXNG_TIMEOUT",
+    "DATABASE_URL", "DATABASE_ECHO", "DATABASE_POOL_SIZE",
+    "SECRET_KEY", "ENCRYPTION_KEY", "RATE_LIMIT_PER_HOUR", "MAX_RETRIES",
+    "LOG_LEVEL", "LOG_FORMAT", "LOG_FILE", "LOG_MAX_BYTES", "LOG_BACKUP_COUNT",
+})
+
 class Environment(Enum):
     """Environment types"""
     DEVELOPMENT = "development"
     TESTING = "testing"
     PRODUCTION = "production"
 
-@dataclass
+_ENV_BY_VALUE = {e.value: e for e in Environment}
+
+@dataclass(slots=True)
 class TwitterConfig:
     """Twitter API configuration - supports both OAuth 1.0a and OAuth 2.0"""
     # Legacy OAuth 1.0a credentials (optional)
@@ -38,36 +76,36 @@ class TwitterConfig:
     oauth_refresh_token: str
     oauth_user_id: str
     
+    # Attempts for tweet/reply posting on rate limits and transient errors
+    post_retry_attempts: int = 3
+    
     def is_valid(self) -> bool:
         """Validate Twitter configuration - OAuth 2.0 OR OAuth 1.0a"""
-        # Check OAuth 2.0 credentials first (preferred)
-        oauth2_fields = [
-            self.oauth_client_id, self.oauth_client_secret, self.oauth_access_token
-        ]
-        if all(field and len(field) > 10 for field in oauth2_fields):
-            return True
-        
-        # Fallback to legacy OAuth 1.0a credentials
-        legacy_fields = [
-            self.api_key, self.api_secret, self.access_token,
-            self.access_token_secret, self.bearer_token
-        ]
-        return all(field and len(field) > 10 for field in legacy_fields)
+        # Check OAuth 2.0 credentials first (preferred), then legacy OAuth 1.0a
+        return self.has_oauth2() or self.has_legacy()
     
     def has_oauth2(self) -> bool:
         """Check if OAuth 2.0 credentials are available"""
-        oauth2_fields = [
-            self.oauth_client_id, self.oauth_client_secret, self.oauth_access_token
-        ]
-        return all(field and len(field) > 10 for field in oauth2_fields)
+        client_id = self.oauth_client_id
+        client_secret = self.oauth_client_secret
+        access_token = self.oauth_access_token
+        return bool(
+            client_id and client_secret and access_token
+            and len(client_id) > 10 and len(client_secret) > 10 and len(access_token) > 10
+        )
     
     def has_legacy(self) -> bool:
         """Check if legacy OAuth 1.0a credentials are available"""
-        legacy_fields = [
-            self.api_key, self.api_secret, self.access_token,
-            self.access_token_secret, self.bearer_token
-        ]
-        return all(field and len(field) > 10 for field in legacy_fields)
+        api_key = self.api_key
+        api_secret = self.api_secret
+        access_token = self.access_token
+        access_token_secret = self.access_token_secret
+        bearer_token = self.bearer_token
+        return bool(
+            api_key and api_secret and access_token and access_token_secret and bearer_token
+            and len(api_key) > 10 and len(api_secret) > 10 and len(access_token) > 10
+            and len(access_token_secret) > 10 and len(bearer_token) > 10
+        )
 
 class AIProvider(Enum):
     """AI provider options"""
@@ -75,7 +113,9 @@ class AIProvider(Enum):
     CLAUDE = "claude"
     OPENAI = "openai"
 
-@dataclass
+_AI_PROVIDER_BY_VALUE = {p.value: p for p in AIProvider}
+
+@dataclass(slots=True)
 class GeminiConfig:
     """Gemini AI configuration"""
     api_key: str
@@ -87,9 +127,9 @@ class GeminiConfig:
     
     def is_valid(self) -> bool:
         """Validate Gemini configuration"""
-        return bool(self.api_key and len(self.api_key) > 10)
+        return self.api_key is not None and len(self.api_key) > 10
 
-@dataclass
+@dataclass(slots=True)
 class ClaudeConfig:
     """Claude AI configuration"""
     api_key: str
@@ -99,9 +139,9 @@ class ClaudeConfig:
     
     def is_valid(self) -> bool:
         """Validate Claude configuration"""
-        return bool(self.api_key and len(self.api_key) > 10)
+        return self.api_key is not None and len(self.api_key) > 10
 
-@dataclass
+@dataclass(slots=True)
 class OpenAIConfig:
     """OpenAI configuration"""
     api_key: str
@@ -111,33 +151,40 @@ class OpenAIConfig:
     
     def is_valid(self) -> bool:
         """Validate OpenAI configuration"""
-        return bool(self.api_key and len(self.api_key) > 10)
+        return self.api_key is not None and len(self.api_key) > 10
 
-@dataclass
+@dataclass(slots=True)
 class AIConfig:
     """Unified AI configuration"""
     provider: AIProvider = AIProvider.GEMINI
     gemini: GeminiConfig = None
     claude: ClaudeConfig = None
     openai: OpenAIConfig = None
+    _providers: Dict[AIProvider, Any] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self):
+        """Bind the provider -> config dispatch table once"""
+        self._providers = {
+            AIProvider.GEMINI: self.gemini,
+            AIProvider.CLAUDE: self.claude,
+            AIProvider.OPENAI: self.openai,
+        }
     
     def get_current_provider_config(self):
         """Get configuration for current provider"""
-        if self.provider == AIProvider.GEMINI:
-            return self.gemini
-        elif self.provider == AIProvider.CLAUDE:
-            return self.claude
-        elif self.provider == AIProvider.OPENAI:
-            return self.openai
-        else:
-            raise ValueError(f"Unknown AI provider: {self.provider}")
+        try:
+            return self._providers[self.provider]
+        except KeyError:
+            raise ValueError(f"Unknown AI provider: {self.provider}") from None
     
     def is_valid(self) -> bool:
         """Validate current provider configuration"""
         current_config = self.get_current_provider_config()
         return current_config and current_config.is_valid()
 
-@dataclass
+@dataclass(slots=True)
 class EmailConfig:
     """Email configuration"""
     smtp_host: str
@@ -156,7 +203,7 @@ class EmailConfig:
         ]
         return all(field for field in required_fields) and self.smtp_port > 0
 
-@dataclass
+@dataclass(slots=True)
 class SearxngConfig:
     """SearXNG configuration"""
     base_url: str = "http://localhost:8080"
@@ -166,7 +213,7 @@ class SearxngConfig:
         """Validate SearXNG configuration"""
         return bool(self.base_url and self.timeout > 0)
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database configuration"""
     url: str = "sqlite:///twitter_automation.db"
@@ -177,7 +224,7 @@ class DatabaseConfig:
         """Validate database configuration"""
         return bool(self.url)
 
-@dataclass
+@dataclass(slots=True)
 class SecurityConfig:
     """Security configuration"""
     secret_key: str
@@ -189,7 +236,7 @@ class SecurityConfig:
         """Validate security configuration"""
         return bool(self.secret_key and len(self.secret_key) >= 32)
 
-@dataclass
+@dataclass(slots=True)
 class LoggingConfig:
     """Logging configuration"""
     level: str = "INFO"
@@ -198,23 +245,93 @@ class LoggingConfig:
     max_bytes: int = 10 * 1024 * 1024  # 10MB
     backup_count: int = 5
 
-@dataclass
-class BrandConfig:
-    """Brand and voice configuration"""
-    persona: str = "AI Industry Thought Leader & Tech Strategist"
-    tone: str = "authoritative, analytical, forward-thinking, contrarian when necessary"
-    big_idea: str = "Building AI/SaaS Startups in Public + Actionable Growth Hacks + Navigating the Founder's Journey"
-    
-    # Core expertise areas aligned with top profiles
-    expertise_areas: list = field(default_factory=lambda: [
+# SMTP hosts/ports that get STARTTLS when SMTP_SECURE=auto
+_SECURE_SMTP_SUFFIXES = ("amazonaws.com", "gmail.com", "fastmail.com")
+_SECURE_SMTP_PORTS = frozenset({587, 465})
+
+def _unquote(value: Any) -> Any:
+    """Strip stray surrounding quotes from string config values"""
+    if isinstance(value, str):
+        return value.strip('"').strip("'")
+    return value
+
+def _parse_bool(value: Any) -> bool:
+    """Interpret "true"/"false" style config values"""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() == "true"
+
+# Typed schemas for the flat config sections: (field, key, type, default)
+_GEMINI_SCHEMA = (
+    ("api_key", "GEMINI_API_KEY", str, ""),
+    ("model_name", "GEMINI_MODEL", str, "gemini-2.5-pro"),
+    ("temperature", "GEMINI_TEMPERATURE", float, 0.8),
+    ("top_p", "GEMINI_TOP_P", float, 0.9),
+    ("top_k", "GEMINI_TOP_K", int, 40),
+    ("max_output_tokens", "GEMINI_MAX_TOKENS", int, 2048),
+)
+
+_CLAUDE_SCHEMA = (
+    ("api_key", "CLAUDE_API_KEY", str, ""),
+    ("model_name", "CLAUDE_MODEL", str, "claude-sonnet-4-20250514"),
+    ("temperature", "CLAUDE_TEMPERATURE", float, 0.8),
+    ("max_tokens", "CLAUDE_MAX_TOKENS", int, 2048),
+)
+
+_OPENAI_SCHEMA = (
+    ("api_key", "OPENAI_API_KEY", str, ""),
+    ("model_name", "OPENAI_MODEL", str, "gpt-4o"),
+    ("temperature", "OPENAI_TEMPERATURE", float, 0.8),
+    ("max_tokens", "OPENAI_MAX_TOKENS", int, 2048),
+)
+
+_EMAIL_SCHEMA = (
+    ("smtp_host", "SMTP_HOST", str, ""),
+    ("smtp_port", "SMTP_PORT", int, 587),
+    ("smtp_user", "SMTP_USER", str, ""),
+    ("smtp_password", "SMTP_PASSWORD", str, ""),
+    ("from_email", "SMTP_FROM", str, ""),
+    ("to_email", "TO_EMAIL", str, ""),
+)
+
+_SEARXNG_SCHEMA = (
+    ("base_url", "SEARXNG_URL", str, "http://localhost:8080"),
+    ("timeout", "SEARXNG_TIMEOUT", int, 30),
+)
+
+_DATABASE_SCHEMA = (
+    ("url", "DATABASE_URL", str, "sqlite:///twitter_automation.db"),
+    ("echo", "DATABASE_ECHO", _parse_bool, False),
+    ("pool_size", "DATABASE_POOL_SIZE", int, 10),
+)
+
+_SECURITY_SCHEMA = (
+    ("encryption_key", "ENCRYPTION_KEY", str, None),
+    ("rate_limit_per_hour", "RATE_LIMIT_PER_HOUR", int, 100),
+    ("max_retries", "MAX_RETRIES", int, 3),
+)
+
+_LOGGING_SCHEMA = (
+    ("level", "LOG_LEVEL", str, "INFO"),
+    ("format", "LOG_FORMAT", str, "%(asctime)s | %(levelname)s | %(name)s | %(message)s"),
+    ("file_path", "LOG_FILE", str, "logs/twitter_automation.log"),
+    ("max_bytes", "LOG_MAX_BYTES", int, 10 * 1024 * 1024),
+    ("backup_count", "LOG_BACKUP_COUNT", int, 5),
+)
+
+# Single source of brand defaults, shared by BrandConfig and _load_brand_config.
+# Lists are stored as tuples and copied into each instance.
+_BRAND_DEFAULTS: Dict[str, Any] = {
+    "persona": "Rakesh Roushan",
+    "tone": "professional, analytical, authentic",
+    "big_idea": "Building AI/SaaS Startups in Public + Actionable Growth Hacks + Navigating the Founder's Journey",
+    "expertise_areas": (
         "AI implementation business", "SaaS product strategy", "startup scaling frameworks",
         "prompt engineering business", "MLOps platform strategy", "AI tools productivity",
         "building in public SaaS", "product-led growth", "AI automation workflows",
         "startup founder lessons", "tech leadership insights", "digital transformation AI"
-    ])
-    
-    # Target profiles to emulate
-    inspiration_profiles: list = field(default_factory=lambda: [
+    ),
+    "inspiration_profiles": (
         {"handle": "@sama", "style": "Bold predictions, industry insights, contrarian takes"},
         {"handle": "@AndrewYNg", "style": "Educational frameworks, AI practical applications"},
         {"handle": "@paulg", "style": "Startup wisdom, counterintuitive insights"},
@@ -223,28 +340,19 @@ class BrandConfig:
         {"handle": "@agazdecki", "style": "SaaS acquisition stories, founder journey"},
         {"handle": "@levelsio", "style": "Building in public, indie hacking, transparent metrics"},
         {"handle": "@balajis", "style": "Tech trends, future predictions, data narratives"}
-    ])
-    
-    # Viral content keywords for RSS/trend discovery
-    viral_keywords: list = field(default_factory=lambda: [
+    ),
+    "viral_keywords": (
         "AI implementation business", "SaaS product strategy", "startup scaling frameworks",
-        "AI tools productivity", "building in public SaaS", "product-led growth",
-        "tech leadership insights", "digital transformation AI", "AI automation workflows",
-        "startup founder lessons", "SaaS metrics optimization", "AI ethics business"
-    ])
-    
-    target_hashtags: list = field(default_factory=lambda: [
+        "AI tools productivity", "building in public SaaS", "product-led growth"
+    ),
+    "target_hashtags": (
         "#AI", "#SaaS", "#BuildInPublic", "#StartupLife", "#TechStrategy", 
         "#ProductStrategy", "#AITools", "#FounderJourney", "#Growth", "#Innovation"
-    ])
-    
-    # Viral thread frameworks
-    thread_frameworks: list = field(default_factory=lambda: [
+    ),
+    "thread_frameworks": (
         "listicle", "problem_solution", "storytelling", "before_after_bridge", "contrarian"
-    ])
-    
-    # Hook patterns for viral content
-    hook_patterns: list = field(default_factory=lambda: [
+    ),
+    "hook_patterns": (
         "Most people think {common_belief}, but {contrarian_insight}...",
         "I made a $50K mistake in my first startup. Here's what I learned...",
         "Everyone's talking about {trending_topic}. Here's what they're missing...",
@@ -253,8 +361,88 @@ class BrandConfig:
         "The biggest lie in {industry}: {false_belief}. Here's the truth...",
         "10 lessons from building {specific_achievement}:",
         "Plot twist: {unexpected_insight} (and why it matters)..."
-    ])
+    ),
+}
+
+@dataclass(slots=True)
+class BrandConfig:
+    """Brand and voice configuration"""
+    persona: str = _BRAND_DEFAULTS["persona"]
+    tone: str = _BRAND_DEFAULTS["tone"]
+    big_idea: str = _BRAND_DEFAULTS["big_idea"]
     
+    # Core expertise areas aligned with top profiles
+    expertise_areas: list = field(default_factory=lambda: list(_BRAND_DEFAULTS["expertise_areas"]))
+    
+    # Target profiles to emulate
+    inspiration_profiles: list = field(
+        default_factory=lambda: [dict(profile) for profile in _BRAND_DEFAULTS["inspiration_profiles"]]
+    )
+    
+    # Viral content keywords for RSS/trend discovery
+    viral_keywords: list = field(default_factory=lambda: list(_BRAND_DEFAULTS["viral_keywords"]))
+    
+    target_hashtags: list = field(default_factory=lambda: list(_BRAND_DEFAULTS["target_hashtags"]))
+    
+    # Viral thread frameworks
+    thread_frameworks: list = field(default_factory=lambda: list(_BRAND_DEFAULTS["thread_frameworks"]))
+    
+    # Hook patterns for viral content
+    hook_patterns: list = field(default_factory=lambda: list(_BRAND_DEFAULTS["hook_patterns"]))
+    
+@lru_cache(maxsize=None)
+def _get_yaml_loader():
+    """Import PyYAML on first use; prefer the libyaml-backed loader"""
+    import yaml
+    try:
+        return yaml.CSafeLoader
+    except AttributeError:  # libyaml not available
+        return yaml.SafeLoader
+
+@lru_cache(maxsize=None)
+def _get_dotenv_values():
+    """Import python-dotenv on first use"""
+    from dotenv import dotenv_values
+    return dotenv_values
+
+def _fast_parse_env(text: str) -> Dict[str, str]:
+    """Parse plain KEY=value dotenv content"""
+    values = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, sep, value = line.partition("=")
+        if sep:
+            values[key.strip()] = value.strip().strip("\"'")
+    return values
+
+def _safe_stat(path: str) -> Optional[os.stat_result]:
+    """Stat a path, returning None when it does not exist"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def _load_env_values(path: str, st: os.stat_result) -> Dict[str, str]:
+    """Parse a dotenv file, reusing the cached result while it is unchanged"""
+    key = (path, st.st_mtime_ns, st.st_size)
+    values = _ENV_CACHE.get(key)
+    if values is None:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if _COMPLEX_DOTENV.search(text):
+            values = {k: v for k, v in _get_dotenv_values()(path).items() if v is not None}
+        else:
+            values = _fast_parse_env(text)
+        _ENV_CACHE[key] = values
+    return values
+
+def _apply_env_file(path: str, st: os.stat_result):
+    """Merge a dotenv file into os.environ without overriding existing values"""
+    environ = os.environ
+    environ.update({k: v for k, v in _load_env_values(path, st).items() if k not in environ})
+
 class Config:
     """Unified configuration manager"""
     
@@ -263,10 +451,12 @@ class Config:
         self.env_path = env_path or ".env"
         self.config_path = config_path or "config/config.yml"
         self.environment = self._detect_environment()
+        self._stats: Dict[str, Optional[os.stat_result]] = {}
         
         # Load configurations
         self._load_env_file()
         self._load_yaml_config()
+        self._build_merged_config()
         
         # Initialize configuration objects
         self.twitter = self._load_twitter_config()
@@ -281,16 +471,25 @@ class Config:
         # Backward compatibility - expose current AI provider as 'gemini'
         self.gemini = self.ai.get_current_provider_config()
         
+        # (fingerprint, report) for get_validation_report
+        self._report_cache: Optional[tuple] = None
+        
         logger.info(f"Configuration loaded for environment: {self.environment.value}")
     
     def _detect_environment(self) -> Environment:
         """Detect current environment"""
         env = os.getenv("ENVIRONMENT", "development").lower()
-        try:
-            return Environment(env)
-        except ValueError:
+        environment = _ENV_BY_VALUE.get(env)
+        if environment is None:
             logger.warning(f"Unknown environment '{env}', defaulting to development")
             return Environment.DEVELOPMENT
+        return environment
+    
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        """Stat a config file once per Config construction"""
+        if path not in self._stats:
+            self._stats[path] = _safe_stat(path)
+        return self._stats[path]
     
     def _load_env_file(self):
         """Load environment variables.
@@ -302,8 +501,9 @@ class Config:
         """
         loaded_any = False
         # 1) Explicit path
-        if self.env_path and Path(self.env_path).exists():
-            load_dotenv(self.env_path, override=False)
+        env_stat = self._stat(self.env_path) if self.env_path else None
+        if env_stat is not None:
+            _apply_env_file(self.env_path, env_stat)
             logger.info(f"Loaded environment from: {self.env_path}")
             loaded_any = True
         else:
@@ -312,49 +512,96 @@ class Config:
         
         # 2) If production and production.env exists, load it (non-override)
         if self.environment == Environment.PRODUCTION:
-            prod_path = Path("production.env")
-            if prod_path.exists():
-                load_dotenv(str(prod_path), override=False)
+            prod_stat = self._stat("production.env")
+            if prod_stat is not None:
+                _apply_env_file("production.env", prod_stat)
                 logger.info("Merged environment from: production.env")
                 loaded_any = True
         
         # 3) Load .env as baseline if nothing loaded yet and it exists
-        default_env = Path(".env")
-        if not loaded_any and default_env.exists():
-            load_dotenv(str(default_env), override=False)
-            logger.info("Loaded environment from: .env")
-        elif not loaded_any:
-            logger.warning("No environment file found (.env or production.env)")
+        if not loaded_any:
+            default_stat = self._stat(".env")
+            if default_stat is not None:
+                _apply_env_file(".env", default_stat)
+                logger.info("Loaded environment from: .env")
+            else:
+                logger.warning("No environment file found (.env or production.env)")
     
     def _load_yaml_config(self):
         """Load YAML configuration"""
         self.yaml_config = {}
-        if Path(self.config_path).exists():
+        st = self._stat(self.config_path)
+        if st is not None:
+            key = (self.config_path, st.st_mtime_ns, st.st_size)
+            cached = _YAML_CACHE.get(key)
+            if cached is not None:
+                self.yaml_config = cached
+                logger.debug(f"Using cached YAML config for: {self.config_path}")
+                return
+            
+            import yaml
             with open(self.config_path, 'r') as f:
-                self.yaml_config = yaml.safe_load(f) or {}
+                self.yaml_config = yaml.load(f, Loader=_get_yaml_loader()) or {}
+            _YAML_CACHE[key] = self.yaml_config
             logger.info(f"Loaded YAML config from: {self.config_path}")
         else:
             logger.info(f"YAML config not found: {self.config_path}")
     
+    def _build_merged_config(self):
+        """Flatten YAML and known environment variables into one lookup table.
+        
+        YAML root keys are stored as-is, section keys as "section.key", and
+        environment values under their uppercase name so they take precedence.
+        String values are unquoted once here rather than on every lookup.
+        """
+        merged: Dict[str, Any] = {}
+        for key, value in self.yaml_config.items():
+            if not isinstance(key, str) or key != key.lower():
+                continue
+            merged[key] = _unquote(value)
+            if isinstance(value, dict):
+                for sub_key, sub_value in value.items():
+                    merged[f"{key}.{sub_key}"] = _unquote(sub_value)
+        
+        environ = os.environ
+        for key in _KNOWN_KEYS:
+            value = environ.get(key)
+            if value is not None:
+                merged[key] = _unquote(value)
+        
+        self._merged = merged
+    
     def _get_config_value(self, key: str, default: Any = None, 
                          config_section: Optional[str] = None) -> Any:
         """Get configuration value from env or YAML"""
-        # Try environment variable first
-        env_value = os.getenv(key.upper())
-        if env_value is not None:
-            return env_value
+        merged = self._merged
+        upper_key = key.upper()
         
-        # Try YAML configuration
-        if config_section and config_section in self.yaml_config:
-            section = self.yaml_config[config_section]
-            if key.lower() in section:
-                return section[key.lower()]
+        # Environment variables first (unknown keys are looked up directly)
+        if upper_key in merged:
+            return merged[upper_key]
+        if upper_key not in _KNOWN_KEYS:
+            env_value = os.environ.get(upper_key)
+            if env_value is not None:
+                return _unquote(env_value)
         
-        # Try root YAML configuration
-        if key.lower() in self.yaml_config:
-            return self.yaml_config[key.lower()]
+        # Then the YAML section, then the YAML root
+        lower_key = key.lower()
+        if config_section:
+            section_key = f"{config_section}.{lower_key}"
+            if section_key in merged:
+                return merged[section_key]
         
-        return default
+        return merged.get(lower_key, default)
+    
+    def _coerce(self, schema: tuple) -> Dict[str, Any]:
+        """Resolve and type-convert every entry of a config schema"""
+        get = self._get_config_value
+        values = {}
+        for field_name, key, cast, default in schema:
+            raw = get(key)
+            values[field_name] = default if raw is None or raw == "" else cast(raw)
+        return values
     
     def _load_twitter_config(self) -> TwitterConfig:
         """Load Twitter configuration - supports both OAuth 1.0a and OAuth 2.0"""
@@ -367,11 +614,12 @@ class Config:
             bearer_token=self._get_config_value("TWITTER_BEARER_TOKEN", ""),
             
             # OAuth 2.0 credentials
-            oauth_client_id=self._get_config_value("TWITTER_OAUTH_CLIENT_ID", "").strip('"'),
-            oauth_client_secret=self._get_config_value("TWITTER_OAUTH_CLIENT_SECRET", "").strip('"'),
+            oauth_client_id=self._get_config_value("TWITTER_OAUTH_CLIENT_ID", ""),
+            oauth_client_secret=self._get_config_value("TWITTER_OAUTH_CLIENT_SECRET", ""),
             oauth_access_token=self._get_config_value("TWITTER_OAUTH_ACCESS_TOKEN", ""),
             oauth_refresh_token=self._get_config_value("TWITTER_OAUTH_REFRESH_TOKEN", ""),
-            oauth_user_id=self._get_config_value("TWITTER_OAUTH_USER_ID", "")
+            oauth_user_id=self._get_config_value("TWITTER_OAUTH_USER_ID", ""),
+            post_retry_attempts=int(self._get_config_value("TWITTER_POST_RETRY_ATTEMPTS", "") or 3)
         )
     
     def _load_ai_config(self) -> AIConfig:
@@ -379,90 +627,44 @@ class Config:
         
         # Determine AI provider from environment or config
         provider_str = self._get_config_value("AI_PROVIDER", "gemini").lower()
-        try:
-            provider = AIProvider(provider_str)
-        except ValueError:
+        provider = _AI_PROVIDER_BY_VALUE.get(provider_str)
+        if provider is None:
             logger.warning(f"Unknown AI provider '{provider_str}', defaulting to Gemini")
             provider = AIProvider.GEMINI
         
-        # Load Gemini configuration
-        gemini_config = GeminiConfig(
-            api_key=self._get_config_value("GEMINI_API_KEY", ""),
-            model_name=self._get_config_value("GEMINI_MODEL", "gemini-2.5-pro"),
-            temperature=float(self._get_config_value("GEMINI_TEMPERATURE", "0.8")),
-            top_p=float(self._get_config_value("GEMINI_TOP_P", "0.9")),
-            top_k=int(self._get_config_value("GEMINI_TOP_K", "40")),
-            max_output_tokens=int(self._get_config_value("GEMINI_MAX_TOKENS", "2048"))
-        )
-        
-        # Load Claude configuration
-        claude_config = ClaudeConfig(
-            api_key=self._get_config_value("CLAUDE_API_KEY", ""),
-            model_name=self._get_config_value("CLAUDE_MODEL", "claude-sonnet-4-20250514"),
-            temperature=float(self._get_config_value("CLAUDE_TEMPERATURE", "0.8")),
-            max_tokens=int(self._get_config_value("CLAUDE_MAX_TOKENS", "2048"))
-        )
-        
-        # Load OpenAI configuration
-        openai_config = OpenAIConfig(
-            api_key=self._get_config_value("OPENAI_API_KEY", ""),
-            model_name=self._get_config_value("OPENAI_MODEL", "gpt-4o"),
-            temperature=float(self._get_config_value("OPENAI_TEMPERATURE", "0.8")),
-            max_tokens=int(self._get_config_value("OPENAI_MAX_TOKENS", "2048"))
-        )
-        
         return AIConfig(
             provider=provider,
-            gemini=gemini_config,
-            claude=claude_config,
-            openai=openai_config
+            gemini=GeminiConfig(**self._coerce(_GEMINI_SCHEMA)),
+            claude=ClaudeConfig(**self._coerce(_CLAUDE_SCHEMA)),
+            openai=OpenAIConfig(**self._coerce(_OPENAI_SCHEMA))
         )
     
     def _load_email_config(self) -> EmailConfig:
         """Load email configuration"""
         
-        smtp_host = self._get_config_value("SMTP_HOST", "")
-        smtp_port = int(self._get_config_value("SMTP_PORT", "587"))
+        values = self._coerce(_EMAIL_SCHEMA)
+        smtp_host = values["smtp_host"]
+        smtp_port = values["smtp_port"]
         
         # Automatically enable STARTTLS for common secure SMTP providers
         smtp_secure = self._get_config_value("SMTP_SECURE", "auto").lower()
         
         if smtp_secure == "auto":
             # Auto-detect based on host and port
-            if ("amazonaws.com" in smtp_host or 
-                "gmail.com" in smtp_host or 
-                "fastmail.com" in smtp_host or
-                smtp_port in [587, 465]):
-                smtp_secure = True
-            else:
-                smtp_secure = False
+            smtp_secure = (smtp_port in _SECURE_SMTP_PORTS or
+                           smtp_host.lower().endswith(_SECURE_SMTP_SUFFIXES))
         else:
             smtp_secure = smtp_secure == "true"
         
-        return EmailConfig(
-            smtp_host=smtp_host,
-            smtp_port=smtp_port,
-            smtp_user=self._get_config_value("SMTP_USER", ""),
-            smtp_password=self._get_config_value("SMTP_PASSWORD", ""),
-            smtp_secure=smtp_secure,
-            from_email=self._get_config_value("SMTP_FROM", ""),
-            to_email=self._get_config_value("TO_EMAIL", "")
-        )
+        return EmailConfig(smtp_secure=smtp_secure, **values)
     
     def _load_searxng_config(self) -> SearxngConfig:
         """Load SearXNG configuration"""
-        return SearxngConfig(
-            base_url=self._get_config_value("SEARXNG_URL", "http://localhost:8080"),
-            timeout=int(self._get_config_value("SEARXNG_TIMEOUT", "30"))
-        )
+        return SearxngConfig(**self._coerce(_SEARXNG_SCHEMA))
     
     def _load_database_config(self) -> DatabaseConfig:
         """Load database configuration"""
-        return DatabaseConfig(
-            url=self._get_config_value("DATABASE_URL", "sqlite:///twitter_automation.db"),
-            echo=self._get_config_value("DATABASE_ECHO", "false").lower() == "true",
-            pool_size=int(self._get_config_value("DATABASE_POOL_SIZE", "10"))
-        )
+        return DatabaseConfig(**self._coerce(_DATABASE_SCHEMA))
     
     def _load_security_config(self) -> SecurityConfig:
         """Load security configuration"""
@@ -473,46 +675,23 @@ class Config:
             secret_key = secrets.token_urlsafe(32)
             logger.warning("Generated temporary secret key - set SECRET_KEY in production")
         
-        return SecurityConfig(
-            secret_key=secret_key,
-            encryption_key=self._get_config_value("ENCRYPTION_KEY"),
-            rate_limit_per_hour=int(self._get_config_value("RATE_LIMIT_PER_HOUR", "100")),
-            max_retries=int(self._get_config_value("MAX_RETRIES", "3"))
-        )
+        return SecurityConfig(secret_key=secret_key, **self._coerce(_SECURITY_SCHEMA))
     
     def _load_logging_config(self) -> LoggingConfig:
         """Load logging configuration"""
-        return LoggingConfig(
-            level=self._get_config_value("LOG_LEVEL", "INFO"),
-            format=self._get_config_value("LOG_FORMAT", 
-                "%(asctime)s | %(levelname)s | %(name)s | %(message)s"),
-            file_path=self._get_config_value("LOG_FILE", "logs/twitter_automation.log"),
-            max_bytes=int(self._get_config_value("LOG_MAX_BYTES", str(10 * 1024 * 1024))),
-            backup_count=int(self._get_config_value("LOG_BACKUP_COUNT", "5"))
-        )
+        return LoggingConfig(**self._coerce(_LOGGING_SCHEMA))
     
     def _load_brand_config(self) -> BrandConfig:
         """Load brand configuration"""
         brand_section = self.yaml_config.get("brand", {})
         
         return BrandConfig(
-            persona=brand_section.get("persona", "Rakesh Roushan"),
-            tone=brand_section.get("tone", "professional, analytical, authentic"),
-            big_idea=brand_section.get("big_idea", "Building AI/SaaS Startups in Public + Actionable Growth Hacks + Navigating the Founder's Journey"),
-            expertise_areas=brand_section.get("expertise_areas", [
-                "AI implementation business", "SaaS product strategy", "startup scaling frameworks",
-                "prompt engineering business", "MLOps platform strategy", "AI tools productivity",
-                "building in public SaaS", "product-led growth", "AI automation workflows",
-                "startup founder lessons", "tech leadership insights", "digital transformation AI"
-            ]),
-            viral_keywords=brand_section.get("viral_keywords", [
-                "AI implementation business", "SaaS product strategy", "startup scaling frameworks",
-                "AI tools productivity", "building in public SaaS", "product-led growth"
-            ]),
-            target_hashtags=brand_section.get("target_hashtags", [
-                "#AI", "#SaaS", "#BuildInPublic", "#StartupLife", "#TechStrategy", 
-                "#ProductStrategy", "#AITools", "#FounderJourney", "#Growth", "#Innovation"
-            ])
+            persona=brand_section.get("persona", _BRAND_DEFAULTS["persona"]),
+            tone=brand_section.get("tone", _BRAND_DEFAULTS["tone"]),
+            big_idea=brand_section.get("big_idea", _BRAND_DEFAULTS["big_idea"]),
+            expertise_areas=brand_section.get("expertise_areas", list(_BRAND_DEFAULTS["expertise_areas"])),
+            viral_keywords=brand_section.get("viral_keywords", list(_BRAND_DEFAULTS["viral_keywords"])),
+            target_hashtags=brand_section.get("target_hashtags", list(_BRAND_DEFAULTS["target_hashtags"]))
         )
     
     def validate(self) -> Dict[str, bool]:
@@ -531,8 +710,29 @@ class Config:
         
         return validation_results
     
+    def _validation_fingerprint(self) -> tuple:
+        """Snapshot of every value that feeds validate()"""
+        twitter = self.twitter
+        email = self.email
+        provider_config = self.ai.get_current_provider_config()
+        return (
+            self.environment,
+            twitter.api_key, twitter.api_secret, twitter.access_token,
+            twitter.access_token_secret, twitter.bearer_token,
+            twitter.oauth_client_id, twitter.oauth_client_secret, twitter.oauth_access_token,
+            self.ai.provider, provider_config.api_key if provider_config else None,
+            email.smtp_host, email.smtp_port, email.smtp_user, email.smtp_password,
+            email.from_email, email.to_email,
+            self.searxng.base_url, self.searxng.timeout,
+            self.database.url, self.security.secret_key,
+        )
+    
     def get_validation_report(self) -> str:
         """Get detailed validation report"""
+        fingerprint = self._validation_fingerprint()
+        if self._report_cache is not None and self._report_cache[0] == fingerprint:
+            return self._report_cache[1]
+        
         results = self.validate()
         
         report = f"🔍 Configuration Validation Report - {self.environment.value.title()}\n"
@@ -553,6 +753,7 @@ class Config:
         if not results["email"]:
             report += "\n🔧 Email: Configure SMTP settings for email pipeline"
         
+        self._report_cache = (fingerprint, report)
         return report
     
     def is_production_ready(self) -> bool:
@@ -564,6 +765,7 @@ class Config:
 
 # Global configuration instance
 _config_instance: Optional[Config] = None
+_config_lock = threading.Lock()
 
 def get_config(env_path: Optional[str] = None, 
                config_path: Optional[str] = None,
@@ -571,7 +773,11 @@ def get_config(env_path: Optional[str] = None,
     """Get global configuration instance"""
     global _config_instance
     
-    if _config_instance is None or force_reload:
-        _config_instance = Config(env_path, config_path)
+    instance = _config_instance
+    if instance is not None and not force_reload:
+        return instance
     
-    return _config_instance
+    with _config_lock:
+        if _config_instance is None or force_reload:
+            _config_instance = Config(env_path, config_path)
+        return _config_instance
@@ -5,12 +5,15 @@ Analyzes target Twitter profiles for engagement opportunities
 """
 
 import logging
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 import random
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+_SCORE_KEY = itemgetter('engagement_score')
+
 class ProfileAnalyzer:
     """Analyzes target profiles for engagement opportunities"""
     
@@ -291,7 +294,7 @@ class ProfileAnalyzer:
                         break
             
             # Sort by engagement score and return top unique opportunities
-            unique_opportunities.sort(key=lambda x: x['engagement_score'], reverse=True)
+            unique_opportunities.sort(key=_SCORE_KEY, reverse=True)
             
             return unique_opportunities[:count]
             
@@ -6,18 +6,130 @@ Handles all Twitter API interactions with proper error handling and rate limitin
 
 import logging
 import tweepy
-from typing import Dict, Any, List, Optional
-from tenacity import retry, stop_after_attempt, wait_exponential
+from typing import Dict, Any, List, Optional, Tuple
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+import json
+import socket
 import time
+import threading
+from dataclasses import dataclass, field
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
 from .twitter_oauth import (
     TwitterOAuth,
     TokenStorage,
     get_oauth_config_from_env,
 )
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+if orjson is not None:
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+else:
+    _loads = json.loads
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode()
+
+# Pooled connections to api.twitter.com; also the default search fan-out width
+_HTTP_POOL_SIZE = 8
+
+class _TwitterAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets keep TCP keepalive on between sparse calls"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+# Longest server-requested backoff we are willing to sleep (one rate-limit window)
+_MAX_SERVER_WAIT_SECONDS = 900
+
+# Search query suffixes keyed by (exclude_replies, exclude_retweets)
+_SEARCH_SUFFIX = {
+    (True, True): " -is:reply -is:retweet",
+    (True, False): " -is:reply",
+    (False, True): " -is:retweet",
+    (False, False): ""
+}
+
+# Fixed field/expansion parameters for recent search
+_SEARCH_PARAMS = {
+    "tweet.fields": "created_at,author_id,public_metrics,context_annotations",
+    "user.fields": "username,name,verified",
+    "expansions": "author_id"
+}
+
+# Author fields used when a tweet's author is missing from the response includes
+_UNKNOWN_AUTHOR = {'username': 'unknown', 'name': 'Unknown', 'verified': False}
+
+@dataclass(slots=True)
+class TweetRow:
+    """Flattened tweet returned by the read endpoints"""
+    id: str
+    text: str
+    created_at: Optional[str]
+    author_id: Optional[str]
+    author_username: str
+    author_name: str
+    author_verified: bool
+    public_metrics: Dict[str, Any]
+    context_annotations: List[Dict[str, Any]] = field(default_factory=list)
+
+def _tweet_row(tweet: Dict[str, Any], author: Dict[str, Any]) -> TweetRow:
+    """Build a TweetRow from a v2 tweet object and its author's user object"""
+    return TweetRow(
+        id=tweet['id'],
+        text=tweet['text'],
+        created_at=tweet.get('created_at'),
+        author_id=tweet.get('author_id', author.get('id')),
+        author_username=author.get('username', 'unknown'),
+        author_name=author.get('name', 'Unknown'),
+        author_verified=author.get('verified', False),
+        public_metrics=tweet.get('public_metrics') or {},
+        context_annotations=tweet.get('context_annotations') or []
+    )
+
+# How long a healthy /2/users/me result is reused (the endpoint has a very low quota)
+_HEALTH_CACHE_TTL_SECONDS = 900
+
+# After a failed token refresh, skip proactive (pre-expiry) refreshes for this long
+_REFRESH_FAILURE_COOLDOWN_SECONDS = 300
+
+def _is_retryable_error(exc: BaseException) -> bool:
+    """Retry only rate limits, transient server errors and connection failures"""
+    if isinstance(exc, (tweepy.errors.TooManyRequests, requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(exc, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status == 429 or (status is not None and status >= 500)
+
+def _wait_server_hint(fallback):
+    """Tenacity wait honoring Retry-After / x-rate-limit-reset, else the fallback backoff"""
+    def _wait(retry_state) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+        try:
+            retry_after = headers.get('Retry-After')
+            if retry_after:
+                return min(float(retry_after), _MAX_SERVER_WAIT_SECONDS)
+            reset = headers.get('x-rate-limit-reset')
+            if reset:
+                return min(max(0.0, float(reset) - time.time()) + 1, _MAX_SERVER_WAIT_SECONDS)
+        except (TypeError, ValueError):
+            pass
+        return fallback(retry_state)
+    return _wait
+
 class TwitterAPI:
     """Twitter API client with error handling and rate limiting"""
     
@@ -28,16 +140,29 @@ class TwitterAPI:
         if not self.config.is_valid():
             raise ValueError("Invalid Twitter API configuration")
         
+        # Shared keep-alive HTTP session for direct API calls and token refreshes
+        self._http = requests.Session()
+        self._http.mount("https://", _TwitterAdapter(pool_connections=4, pool_maxsize=_HTTP_POOL_SIZE, max_retries=0))
+        
         # OAuth token management helpers (used for OAuth 2.0 user context)
         self.user_id = getattr(self.config, 'oauth_user_id', None) or "oauth_user"
         self.token_storage = TokenStorage()
+        # Token writes happen off the request path, and only when the tokens changed
+        self._save_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='token-save')
+        self._last_saved_tokens: Optional[Tuple[Any, Any]] = None
         oauth_env = get_oauth_config_from_env()
         self.oauth_helper = TwitterOAuth(
             client_id=oauth_env.get('client_id', ''),
             client_secret=oauth_env.get('client_secret', ''),
-            callback_url=oauth_env.get('callback_url', 'http://localhost:8000/auth/twitter/callback')
+            callback_url=oauth_env.get('callback_url', 'http://localhost:8000/auth/twitter/callback'),
+            session=self._http
         )
         self._tokens: Optional[Dict[str, Any]] = None
+        # Single-flight token refresh shared by concurrent callers
+        self._refresh_lock = threading.Lock()
+        self._refresh_future: Optional[Future] = None
+        # Monotonic time of the last failed refresh, to back off proactive refreshes
+        self._refresh_failed_at: Optional[float] = None
         
         # Initialize Tweepy client - prefer OAuth 2.0 for write permissions
         if self.config.has_oauth2():
@@ -46,8 +171,8 @@ class TwitterAPI:
             # Prefer stored tokens; refresh if needed
             tokens = self._load_or_refresh_tokens()
             access_token = (tokens or {}).get('access_token') or self.config.oauth_access_token
-            # Keep a Tweepy client for read/search endpoints (works with bearer token)
-            self.client = tweepy.Client(bearer_token=access_token, wait_on_rate_limit=False)
+            # Reads and writes use direct v2 REST with the user token; Tweepy is OAuth 1.0a only
+            self.client = None
             # Keep current tokens in memory for refresh attempts
             self._tokens = tokens or {
                 'access_token': access_token,
@@ -68,16 +193,36 @@ class TwitterAPI:
             self.auth_type = "OAuth 1.0a"
             logger.info("🔐 Using OAuth 1.0a authentication for Twitter API")
         
-        # Rate limiting state
+        # Rate limiting state (monotonic timestamps, immune to wall-clock steps)
         self.last_post_time = None
         self.last_search_time = None
         self.min_post_interval = 3600  # 1 hour between posts
         self.min_search_interval = 60   # 1 minute between searches
+        # Shared retry policies for writes (post attempts are configurable)
+        self._post_retry = Retrying(
+            stop=stop_after_attempt(getattr(self.config, 'post_retry_attempts', 3)),
+            wait=_wait_server_hint(wait_exponential(multiplier=1, min=4, max=10)),
+            retry=retry_if_exception(_is_retryable_error),
+            reraise=True
+        )
+        self._reply_retry = Retrying(
+            stop=stop_after_attempt(2),
+            wait=_wait_server_hint(wait_exponential(multiplier=1, min=2, max=5)),
+            retry=retry_if_exception(_is_retryable_error),
+            reraise=True
+        )
+        # Server-reported limits per endpoint: (remaining, reset epoch)
+        self._rl: Dict[str, Tuple[int, int]] = {}
+        # Last healthy health_check result: (checked_at, result)
+        self._me_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        # Resolved users by lowercase username: {'id', 'username', 'name', 'verified'}
+        self._user_cache: Dict[str, Dict[str, Any]] = {}
+        self._user_cache_size = 1024
         
         logger.info("🐦 Twitter API client initialized")
     
-    def _check_rate_limit_headers(self, response):
-        """Monitor rate limit headers for optimization"""
+    def _check_rate_limit_headers(self, response, endpoint: Optional[str] = None):
+        """Monitor rate limit headers and remember them per endpoint"""
         if hasattr(response, 'headers'):
             headers = response.headers
             
@@ -86,6 +231,12 @@ class TwitterAPI:
             remaining = headers.get('x-rate-limit-remaining') 
             reset = headers.get('x-rate-limit-reset')
             
+            if endpoint and remaining is not None and reset is not None:
+                try:
+                    self._rl[endpoint] = (int(remaining), int(reset))
+                except ValueError:
+                    pass
+            
             if all([limit, remaining, reset]):
                 logger.info(f"📊 Rate limits: {remaining}/{limit} remaining, resets at {reset}")
                 
@@ -96,12 +247,12 @@ class TwitterAPI:
                 if remaining_int < limit_int * 0.1:  # Less than 10% remaining
                     logger.warning(f"⚠️ Rate limit warning: Only {remaining_int} requests remaining")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
     def post_tweet(self, content: str, **kwargs) -> Optional[str]:
         """Post a tweet with retry logic"""
+        return self._post_retry(self._post_tweet_once, content, **kwargs)
+    
+    def _post_tweet_once(self, content: str, **kwargs) -> Optional[str]:
+        """Single tweet post attempt"""
         
         try:
             # Ensure valid OAuth2 token/client before posting
@@ -109,7 +260,7 @@ class TwitterAPI:
                 # Use direct HTTP for OAuth2 user-context posting to avoid OAuth1 fallback in Tweepy
                 tweet_id = self._http_post_tweet(content, **kwargs)
                 if tweet_id:
-                    self.last_post_time = time.time()
+                    self.last_post_time = time.monotonic()
                     logger.info(f"✅ Tweet posted successfully: {tweet_id}")
                     return tweet_id
                 return None
@@ -129,7 +280,7 @@ class TwitterAPI:
             
             if response.data:
                 tweet_id = response.data['id']
-                self.last_post_time = time.time()
+                self.last_post_time = time.monotonic()
                 
                 logger.info(f"✅ Tweet posted successfully: {tweet_id}")
                 return tweet_id
@@ -140,19 +291,19 @@ class TwitterAPI:
         except tweepy.errors.Unauthorized as e:
             # Attempt one refresh on unauthorized (likely expired token)
             logger.warning(f"Unauthorized when posting tweet: {e}. Attempting token refresh...")
-            if self._attempt_refresh_and_rebuild_client():
+            if self._attempt_token_refresh():
                 try:
                     if self.auth_type == "OAuth 2.0 User Context":
                         tweet_id = self._http_post_tweet(content, **kwargs)
                         if tweet_id:
-                            self.last_post_time = time.time()
+                            self.last_post_time = time.monotonic()
                             logger.info(f"✅ Tweet posted successfully after refresh: {tweet_id}")
                             return tweet_id
                     else:
                         response = self.client.create_tweet(text=content, **kwargs)
                         if response.data:
                             tweet_id = response.data['id']
-                            self.last_post_time = time.time()
+                            self.last_post_time = time.monotonic()
                             logger.info(f"✅ Tweet posted successfully after refresh: {tweet_id}")
                             return tweet_id
                 except Exception as retry_err:
@@ -168,19 +319,19 @@ class TwitterAPI:
             logger.error(f"Error posting tweet: {e}")
             raise
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=2, max=5)
-    )
     def reply_to_tweet(self, tweet_id: str, content: str) -> Optional[str]:
         """Reply to a specific tweet"""
+        return self._reply_retry(self._reply_to_tweet_once, tweet_id, content)
+    
+    def _reply_to_tweet_once(self, tweet_id: str, content: str) -> Optional[str]:
+        """Single reply attempt"""
         
         try:
             # Ensure valid OAuth2 token/client before replying
             if self.auth_type == "OAuth 2.0 User Context":
                 reply_id = self._http_reply_to_tweet(tweet_id, content)
                 if reply_id:
-                    self.last_post_time = time.time()
+                    self.last_post_time = time.monotonic()
                     logger.info(f"✅ Reply posted successfully: {reply_id}")
                     return reply_id
                 return None
@@ -203,7 +354,7 @@ class TwitterAPI:
             
             if response.data:
                 reply_id = response.data['id']
-                self.last_post_time = time.time()
+                self.last_post_time = time.monotonic()
                 
                 logger.info(f"✅ Reply posted successfully: {reply_id}")
                 return reply_id
@@ -213,12 +364,12 @@ class TwitterAPI:
                 
         except tweepy.errors.Unauthorized as e:
             logger.warning(f"Unauthorized when replying: {e}. Attempting token refresh...")
-            if self._attempt_refresh_and_rebuild_client():
+            if self._attempt_token_refresh():
                 try:
                     if self.auth_type == "OAuth 2.0 User Context":
                         reply_id = self._http_reply_to_tweet(tweet_id, content)
                         if reply_id:
-                            self.last_post_time = time.time()
+                            self.last_post_time = time.monotonic()
                             logger.info(f"✅ Reply posted successfully after refresh: {reply_id}")
                             return reply_id
                     else:
@@ -228,7 +379,7 @@ class TwitterAPI:
                         )
                         if response.data:
                             reply_id = response.data['id']
-                            self.last_post_time = time.time()
+                            self.last_post_time = time.monotonic()
                             logger.info(f"✅ Reply posted successfully after refresh: {reply_id}")
                             return reply_id
                 except Exception as retry_err:
@@ -238,15 +389,11 @@ class TwitterAPI:
             logger.error(f"Error posting reply: {e}")
             raise
     
-    @retry(
-        stop=stop_after_attempt(2),
-        wait=wait_exponential(multiplier=1, min=2, max=5)
-    )
     def search_tweets(self, 
                      query: str, 
                      max_results: int = 10,
                      exclude_replies: bool = True,
-                     exclude_retweets: bool = True) -> List[Dict[str, Any]]:
+                     exclude_retweets: bool = True) -> List[TweetRow]:
         """Search for tweets"""
         
         try:
@@ -255,166 +402,259 @@ class TwitterAPI:
                 logger.warning("Search rate limit check failed")
                 return []
             
-            # Build query
-            search_query = query
-            if exclude_replies:
-                search_query += " -is:reply"
-            if exclude_retweets:
-                search_query += " -is:retweet"
+            # Search tweets via v2 REST; plain JSON avoids Tweepy model construction
+            resp = self._api_get("tweets/search/recent", {
+                **_SEARCH_PARAMS,
+                "query": query + _SEARCH_SUFFIX[(bool(exclude_replies), bool(exclude_retweets))],
+                "max_results": min(max_results, 100)  # API limit is 100
+            }, "search")
             
-            # Search tweets
-            response = self.client.search_recent_tweets(
-                query=search_query,
-                max_results=min(max_results, 100),  # API limit is 100
-                tweet_fields=['created_at', 'author_id', 'public_metrics', 'context_annotations'],
-                user_fields=['username', 'name', 'verified'],
-                expansions=['author_id']
-            )
+            self.last_search_time = time.monotonic()
             
-            self.last_search_time = time.time()
+            if resp.status_code == 429:
+                logger.warning("Search rate limit exceeded")
+                return []
+            if not resp.ok:
+                logger.error(f"Error searching tweets: HTTP {resp.status_code}: {resp.text[:200]}")
+                return []
             
-            if not response.data:
+            data = _loads(resp.content)
+            if not data.get('data'):
                 logger.info(f"No tweets found for query: {query}")
                 return []
             
-            # Process results
-            tweets = []
-            users_dict = {}
-            
-            # Create user lookup
-            if response.includes and 'users' in response.includes:
-                users_dict = {user.id: user for user in response.includes['users']}
+            # Author lookup, built once per response
+            users = {user['id']: user for user in (data.get('includes') or {}).get('users', ())}
             
-            for tweet in response.data:
-                author = users_dict.get(tweet.author_id, {})
-                
-                tweet_data = {
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                    'author': {
-                        'id': tweet.author_id,
-                        'username': getattr(author, 'username', 'unknown'),
-                        'name': getattr(author, 'name', 'Unknown'),
-                        'verified': getattr(author, 'verified', False)
-                    },
-                    'public_metrics': tweet.public_metrics or {},
-                    'context_annotations': tweet.context_annotations or []
-                }
-                tweets.append(tweet_data)
+            # Process results
+            tweets = [_tweet_row(tweet, users.get(tweet.get('author_id'), _UNKNOWN_AUTHOR)) for tweet in data['data']]
             
             logger.info(f"✅ Found {len(tweets)} tweets for query: {query}")
             return tweets
             
-        except tweepy.errors.TooManyRequests:
-            logger.warning("Search rate limit exceeded")
-            return []
         except Exception as e:
             logger.error(f"Error searching tweets: {e}")
             return []
     
-    def get_tweet(self, tweet_id: str) -> Optional[Dict[str, Any]]:
+    def search_tweets_many(self, 
+                           queries: List[str], 
+                           max_workers: int = _HTTP_POOL_SIZE,
+                           **kwargs) -> Dict[str, List[TweetRow]]:
+        """Run several searches concurrently over the shared HTTP session"""
+        
+        results: Dict[str, List[TweetRow]] = {}
+        if not queries:
+            return results
+        
+        # Searches are IO-bound, so overlap their round trips instead of waiting N x RTT
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as executor:
+            future_to_query = {
+                executor.submit(self.search_tweets, query, **kwargs): query
+                for query in queries
+            }
+            
+            for future in as_completed(future_to_query):
+                query = future_to_query[future]
+                try:
+                    results[query] = future.result()
+                except Exception as e:
+                    logger.warning(f"Search failed for query {query}: {e}")
+                    results[query] = []
+        
+        return results
+    
+    def get_tweet(self, tweet_id: str) -> Optional[TweetRow]:
         """Get a specific tweet by ID"""
         
         try:
-            response = self.client.get_tweet(
-                tweet_id,
-                tweet_fields=['created_at', 'author_id', 'public_metrics'],
-                user_fields=['username', 'name', 'verified'],
-                expansions=['author_id']
-            )
-            
-            if not response.data:
+            resp = self._api_get(f"tweets/{tweet_id}", {
+                "tweet.fields": "created_at,author_id,public_metrics",
+                "user.fields": "username,name,verified",
+                "expansions": "author_id"
+            }, "tweets/lookup")
+            
+            data = _loads(resp.content) if resp.ok else {}
+            tweet = data.get('data')
+            if not tweet:
                 logger.warning(f"Tweet not found: {tweet_id}")
                 return None
             
-            tweet = response.data
-            author = None
-            
-            if response.includes and 'users' in response.includes:
-                author = response.includes['users'][0]
-            
-            tweet_data = {
-                'id': tweet.id,
-                'text': tweet.text,
-                'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                'author': {
-                    'id': tweet.author_id,
-                    'username': getattr(author, 'username', 'unknown'),
-                    'name': getattr(author, 'name', 'Unknown'),
-                    'verified': getattr(author, 'verified', False)
-                } if author else None,
-                'public_metrics': tweet.public_metrics or {}
-            }
-            
-            return tweet_data
+            users = (data.get('includes') or {}).get('users') or []
+            return _tweet_row(tweet, users[0] if users else _UNKNOWN_AUTHOR)
             
         except Exception as e:
             logger.error(f"Error getting tweet {tweet_id}: {e}")
             return None
     
+    def _cache_user(self, user: Dict[str, Any]) -> Dict[str, Any]:
+        """Remember a resolved user, evicting the oldest entry when full"""
+        info = {
+            'id': user['id'],
+            'username': user['username'],
+            'name': user.get('name', 'Unknown'),
+            'verified': user.get('verified', False)
+        }
+        if len(self._user_cache) >= self._user_cache_size:
+            self._user_cache.pop(next(iter(self._user_cache)))
+        self._user_cache[info['username'].lower()] = info
+        return info
+    
+    def resolve_user(self, username: str) -> Optional[Dict[str, Any]]:
+        """Resolve a username to its user info, using the cache when possible"""
+        
+        cached = self._user_cache.get(username.lower())
+        if cached:
+            return cached
+        
+        resp = self._api_get(f"users/by/username/{username}", {"user.fields": "verified"}, "users/lookup")
+        if not resp.ok:
+            logger.error(f"Error resolving user {username}: HTTP {resp.status_code}")
+            return None
+        user = _loads(resp.content).get('data')
+        if not user:
+            return None
+        return self._cache_user(user)
+    
+    def resolve_user_ids(self, usernames: List[str]) -> Dict[str, str]:
+        """Resolve many usernames to IDs with batched /2/users/by lookups (100 per call)"""
+        
+        resolved: Dict[str, str] = {}
+        # Lowercased name -> every spelling passed in, so 'bob' and 'BOB' are looked up once
+        # and both get the ID
+        missing: Dict[str, List[str]] = {}
+        for username in usernames:
+            cached = self._user_cache.get(username.lower())
+            if cached:
+                resolved[username] = cached['id']
+            else:
+                missing.setdefault(username.lower(), []).append(username)
+        
+        names = list(missing)
+        for start in range(0, len(names), 100):
+            chunk = names[start:start + 100]
+            try:
+                resp = self._api_get("users/by", {"usernames": ",".join(chunk), "user.fields": "verified"}, "users/lookup")
+                resp.raise_for_status()
+            except Exception as e:
+                logger.error(f"Error resolving users {chunk}: {e}")
+                continue
+            for user in _loads(resp.content).get('data') or []:
+                info = self._cache_user(user)
+                for spelling in missing.get(info['username'].lower(), [info['username']]):
+                    resolved[spelling] = info['id']
+        
+        return resolved
+    
     def get_user_tweets(self, 
-                       username: str, 
-                       max_results: int = 10) -> List[Dict[str, Any]]:
-        """Get recent tweets from a specific user"""
+                       username: Optional[str] = None, 
+                       max_results: int = 10,
+                       user_id: Optional[str] = None) -> List[TweetRow]:
+        """Get recent tweets from a specific user (pass user_id to skip the lookup)"""
         
         try:
-            # Get user ID first
-            user = self.client.get_user(username=username)
-            if not user.data:
-                logger.warning(f"User not found: {username}")
-                return []
-            
-            user_id = user.data.id
+            user_info: Dict[str, Any] = {}
+            if user_id is None:
+                if not username:
+                    logger.warning("get_user_tweets needs a username or user_id")
+                    return []
+                user_info = self.resolve_user(username)
+                if not user_info:
+                    logger.warning(f"User not found: {username}")
+                    return []
+                user_id = user_info['id']
+            elif username:
+                user_info = self._user_cache.get(username.lower(), {})
             
             # Get user tweets
-            response = self.client.get_users_tweets(
-                user_id,
-                max_results=min(max_results, 100),
-                tweet_fields=['created_at', 'public_metrics'],
-                exclude=['retweets', 'replies']
-            )
-            
-            if not response.data:
-                logger.info(f"No tweets found for user: {username}")
+            resp = self._api_get(f"users/{user_id}/tweets", {
+                "max_results": min(max_results, 100),
+                "tweet.fields": "created_at,public_metrics",
+                "exclude": "retweets,replies"
+            }, "users/tweets")
+            resp.raise_for_status()
+            
+            data = _loads(resp.content).get('data')
+            if not data:
+                logger.info(f"No tweets found for user: {username or user_id}")
                 return []
             
-            tweets = []
-            for tweet in response.data:
-                tweet_data = {
-                    'id': tweet.id,
-                    'text': tweet.text,
-                    'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                    'author': {
-                        'id': user_id,
-                        'username': username,
-                        'name': user.data.name,
-                        'verified': getattr(user.data, 'verified', False)
-                    },
-                    'public_metrics': tweet.public_metrics or {}
-                }
-                tweets.append(tweet_data)
+            author = {
+                'id': user_id,
+                'username': user_info.get('username', username or 'unknown'),
+                'name': user_info.get('name', 'Unknown'),
+                'verified': user_info.get('verified', False)
+            }
+            tweets = [_tweet_row(tweet, author) for tweet in data]
             
-            logger.info(f"✅ Found {len(tweets)} tweets for user: {username}")
+            logger.info(f"✅ Found {len(tweets)} tweets for user: {username or user_id}")
             return tweets
             
         except Exception as e:
-            logger.error(f"Error getting tweets for user {username}: {e}")
+            logger.error(f"Error getting tweets for user {username or user_id}: {e}")
             return []
     
-    def health_check(self) -> Dict[str, Any]:
-        """Check Twitter API connectivity and permissions"""
+    def get_users_tweets_bulk(self, 
+                              usernames: List[str], 
+                              max_results: int = 10,
+                              concurrency: int = _HTTP_POOL_SIZE) -> Dict[str, List[TweetRow]]:
+        """Get recent tweets for many users: one batched ID lookup, then a bounded fan-out"""
+        
+        results: Dict[str, List[TweetRow]] = {username: [] for username in usernames}
+        user_ids = self.resolve_user_ids(usernames)
+        if not user_ids:
+            return results
+        
+        # Shrink the fan-out to what the server says is left in the current window
+        workers = min(concurrency, len(user_ids))
+        state = self._rl.get("users/tweets")
+        if state and state[1] > time.time():
+            if state[0] <= 0:
+                logger.warning("User timeline rate limit exhausted; skipping bulk fetch")
+                return results
+            workers = min(workers, state[0])
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            future_to_username = {
+                executor.submit(self.get_user_tweets, username, max_results, user_id): username
+                for username, user_id in user_ids.items()
+            }
+            
+            for future in as_completed(future_to_username):
+                username = future_to_username[future]
+                try:
+                    results[username] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to get tweets for user {username}: {e}")
+        
+        return results
+    
+    def health_check(self, force: bool = False) -> Dict[str, Any]:
+        """Check Twitter API connectivity and permissions (cached; force=True to re-probe)"""
+        
+        if not force and self._me_cache and time.monotonic() - self._me_cache[0] < _HEALTH_CACHE_TTL_SECONDS:
+            return self._me_cache[1]
+        
+        result = self._probe_health()
+        if result.get('status') == 'healthy':
+            self._me_cache = (time.monotonic(), result)
+        return result
+    
+    def _probe_health(self) -> Dict[str, Any]:
+        """Query the authenticated user to verify connectivity and permissions"""
         
         try:
             if self.auth_type == "OAuth 2.0 User Context":
                 # Use direct HTTP call for user info with OAuth2 user token
                 headers = self._oauth2_headers()
-                resp = requests.get("https://api.twitter.com/2/users/me", headers=headers, timeout=15)
-                if resp.status_code == 401 and self._attempt_refresh_and_rebuild_client():
-                    headers = self._oauth2_headers()
-                    resp = requests.get("https://api.twitter.com/2/users/me", headers=headers, timeout=15)
+                resp = self._http.get("https://api.twitter.com/2/users/me", headers=headers, timeout=15)
+                if resp.status_code == 401:
+                    new_token = self._attempt_token_refresh()
+                    if new_token:
+                        headers = self._oauth2_headers(new_token)
+                        resp = self._http.get("https://api.twitter.com/2/users/me", headers=headers, timeout=15)
+                self._check_rate_limit_headers(resp, "users/me")
                 if resp.ok:
-                    data = resp.json().get('data') or {}
+                    data = _loads(resp.content).get('data') or {}
                     return {
                         'status': 'healthy',
                         'user_id': data.get('id'),
@@ -460,36 +700,57 @@ class TwitterAPI:
                 'error': str(e)
             }
     
+    def _server_capacity(self, endpoint: str) -> Optional[bool]:
+        """Server-reported capacity for an endpoint (None when unknown or window reset)"""
+        state = self._rl.get(endpoint)
+        if state is None:
+            return None
+        remaining, reset = state
+        if reset <= time.time():
+            return None
+        return remaining > 0
+    
     def _check_post_rate_limit(self) -> bool:
         """Check if we can make a post request"""
         
+        # Skip calls the server has already told us would 429
+        if self._server_capacity("tweets") is False:
+            return False
+        
         if self.last_post_time is None:
             return True
         
-        time_since_last = time.time() - self.last_post_time
+        time_since_last = time.monotonic() - self.last_post_time
         return time_since_last >= self.min_post_interval
     
     def _check_search_rate_limit(self) -> bool:
         """Check if we can make a search request"""
         
+        capacity = self._server_capacity("search")
+        if capacity is not None:
+            # Server-reported limits supersede the fixed search interval
+            return capacity
+        
         if self.last_search_time is None:
             return True
         
-        time_since_last = time.time() - self.last_search_time
+        time_since_last = time.monotonic() - self.last_search_time
         return time_since_last >= self.min_search_interval
     
     def get_rate_limit_status(self) -> Dict[str, Any]:
         """Get current rate limit status"""
         
-        current_time = time.time()
+        current_time = time.monotonic()
+        # Interval bookkeeping is monotonic; convert to epoch seconds for reporting
+        wall_offset = time.time() - current_time
         
         post_remaining_time = 0
-        if self.last_post_time:
+        if self.last_post_time is not None:
             elapsed = current_time - self.last_post_time
             post_remaining_time = max(0, self.min_post_interval - elapsed)
         
         search_remaining_time = 0
-        if self.last_search_time:
+        if self.last_search_time is not None:
             elapsed = current_time - self.last_search_time
             search_remaining_time = max(0, self.min_search_interval - elapsed)
         
@@ -498,8 +759,12 @@ class TwitterAPI:
             'can_search': search_remaining_time == 0,
             'post_wait_seconds': post_remaining_time,
             'search_wait_seconds': search_remaining_time,
-            'last_post_time': self.last_post_time,
-            'last_search_time': self.last_search_time
+            'last_post_time': self.last_post_time + wall_offset if self.last_post_time is not None else None,
+            'last_search_time': self.last_search_time + wall_offset if self.last_search_time is not None else None,
+            'server_limits': {
+                endpoint: {'remaining': remaining, 'reset': reset}
+                for endpoint, (remaining, reset) in self._rl.items()
+            }
         }
 
     # ---------------------------------------------------------------------
@@ -510,6 +775,7 @@ class TwitterAPI:
         try:
             stored = self.token_storage.load_tokens(self.user_id)
             if stored:
+                self._last_saved_tokens = (stored.get('access_token'), stored.get('refresh_token'))
                 if self.oauth_helper.validate_tokens(stored):
                     return stored
                 # Try refresh if we have a refresh token
@@ -518,7 +784,7 @@ class TwitterAPI:
                     # Keep refresh token if not rotated
                     if 'refresh_token' not in refreshed and stored.get('refresh_token'):
                         refreshed['refresh_token'] = stored['refresh_token']
-                    self.token_storage.save_tokens(self.user_id, refreshed)
+                    self._save_executor.submit(self._save_if_changed, self.user_id, refreshed)
                     return refreshed
         except Exception as e:
             logger.warning(f"Token load/refresh from storage failed: {e}")
@@ -534,19 +800,49 @@ class TwitterAPI:
         
         return None
 
+    def _save_if_changed(self, user_id: str, tokens: Dict[str, Any]) -> None:
+        """Persist tokens unless the access/refresh pair matches the last saved one"""
+        key = (tokens.get('access_token'), tokens.get('refresh_token'))
+        if key == self._last_saved_tokens:
+            return
+        self.token_storage.save_tokens(user_id, tokens)
+        self._last_saved_tokens = key
+
     def _ensure_valid_client(self) -> None:
         """Ensure the OAuth2 client is using a valid access token."""
         if not self._tokens:
             return
         try:
             if not self.oauth_helper.validate_tokens(self._tokens):
-                if self._attempt_refresh_and_rebuild_client():
+                if self._attempt_token_refresh():
                     logger.info("🔄 Refreshed access token before request")
         except Exception as e:
             logger.debug(f"Token validation error (continuing): {e}")
 
-    def _attempt_refresh_and_rebuild_client(self) -> bool:
-        """Attempt to refresh access token and rebuild Tweepy client."""
+    def _attempt_token_refresh(self) -> Optional[str]:
+        """Refresh the access token, joining any refresh already in flight; returns the new token."""
+        with self._refresh_lock:
+            in_flight = self._refresh_future
+            owner = in_flight is None
+            if owner:
+                in_flight = self._refresh_future = Future()
+        
+        if not owner:
+            # Another thread is already refreshing - wait for its outcome
+            return in_flight.result()
+        
+        new_token = None
+        try:
+            new_token = self._refresh_tokens()
+            return new_token
+        finally:
+            with self._refresh_lock:
+                self._refresh_future = None
+                self._refresh_failed_at = None if new_token else time.monotonic()
+            in_flight.set_result(new_token)
+
+    def _refresh_tokens(self) -> Optional[str]:
+        """Refresh the OAuth2 access token and return it (None on failure)."""
         try:
             refresh_token = None
             if self._tokens and self._tokens.get('refresh_token'):
@@ -556,25 +852,48 @@ class TwitterAPI:
             
             if not refresh_token:
                 logger.error("No refresh token available to refresh access token")
-                return False
+                return None
             
             refreshed = self.oauth_helper.refresh_access_token(refresh_token)
             if 'refresh_token' not in refreshed and self._tokens and self._tokens.get('refresh_token'):
                 refreshed['refresh_token'] = self._tokens['refresh_token']
             # Persist and update in-memory tokens
-            self.token_storage.save_tokens(self.user_id, refreshed)
+            self._save_executor.submit(self._save_if_changed, self.user_id, refreshed)
             self._tokens = refreshed
-            # Rebuild client with new token
-            new_access_token = refreshed['access_token']
-            self.client = tweepy.Client(bearer_token=new_access_token, wait_on_rate_limit=True)
-            return True
+            self._me_cache = None
+            return refreshed['access_token']
         except Exception as e:
             logger.error(f"Access token refresh failed: {e}")
+            return None
+
+    def _token_near_expiry(self, skew_seconds: int = 60) -> bool:
+        """Check whether the in-memory access token expires within the skew window."""
+        expires_at = (self._tokens or {}).get('expires_at')
+        if not expires_at:
+            # Unknown expiry (e.g. env-provided token) - rely on the 401 path
+            return False
+        try:
+            if isinstance(expires_at, str):
+                expires_at = datetime.fromisoformat(expires_at)
+            if isinstance(expires_at, datetime):
+                expires_at = expires_at.timestamp()
+            return time.time() > float(expires_at) - skew_seconds
+        except (TypeError, ValueError):
             return False
 
-    def _oauth2_headers(self) -> Dict[str, str]:
-        """Build OAuth2 authorization headers with current token."""
-        access_token = None
+    def _oauth2_headers(self, access_token: Optional[str] = None) -> Dict[str, str]:
+        """Build OAuth2 authorization headers with the given or current token."""
+        if access_token:
+            return {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
+        # Refresh ahead of expiry to avoid a guaranteed 401 round trip, unless a refresh
+        # failed recently - then leave it to the 401 path instead of retrying every call
+        failed_at = self._refresh_failed_at
+        recently_failed = failed_at is not None and time.monotonic() - failed_at < _REFRESH_FAILURE_COOLDOWN_SECONDS
+        if not recently_failed and self._token_near_expiry():
+            access_token = self._attempt_token_refresh()
+            if access_token:
+                logger.info("🔄 Refreshed access token ahead of expiry")
+                return {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
         if self._tokens and self._tokens.get('access_token'):
             access_token = self._tokens['access_token']
         elif getattr(self.config, 'oauth_access_token', None):
@@ -583,6 +902,23 @@ class TwitterAPI:
             raise RuntimeError("Missing OAuth2 access token")
         return {"Authorization": f"Bearer {access_token}", "Content-Type": "application/json"}
 
+    def _read_headers(self, access_token: Optional[str] = None) -> Dict[str, str]:
+        """Authorization headers for read endpoints (user token, else app bearer token)."""
+        if self.auth_type == "OAuth 2.0 User Context":
+            return self._oauth2_headers(access_token)
+        return {"Authorization": f"Bearer {self.config.bearer_token}"}
+
+    def _api_get(self, path: str, params: Dict[str, Any], endpoint: str) -> requests.Response:
+        """GET a v2 endpoint, refreshing once on 401 and recording rate-limit headers."""
+        url = f"https://api.twitter.com/2/{path}"
+        resp = self._http.get(url, params=params, headers=self._read_headers(), timeout=15)
+        if resp.status_code == 401 and self.auth_type == "OAuth 2.0 User Context":
+            new_token = self._attempt_token_refresh()
+            if new_token:
+                resp = self._http.get(url, params=params, headers=self._read_headers(new_token), timeout=15)
+        self._check_rate_limit_headers(resp, endpoint)
+        return resp
+
     def _http_post_tweet(self, content: str, **kwargs) -> Optional[str]:
         """Post a tweet using OAuth2 user token via direct HTTP."""
         # Respect rate limiting
@@ -594,13 +930,19 @@ class TwitterAPI:
         if 'in_reply_to_tweet_id' in kwargs:
             payload["reply"] = {"in_reply_to_tweet_id": kwargs['in_reply_to_tweet_id']}
         url = "https://api.twitter.com/2/tweets"
+        body = _dumps(payload)
         headers = self._oauth2_headers()
-        resp = requests.post(url, json=payload, headers=headers, timeout=20)
-        if resp.status_code == 401 and self._attempt_refresh_and_rebuild_client():
-            headers = self._oauth2_headers()
-            resp = requests.post(url, json=payload, headers=headers, timeout=20)
+        resp = self._http.post(url, data=body, headers=headers, timeout=20)
+        if resp.status_code == 401:
+            new_token = self._attempt_token_refresh()
+            if new_token:
+                resp = self._http.post(url, data=body, headers=self._oauth2_headers(new_token), timeout=20)
+        self._check_rate_limit_headers(resp, "tweets")
+        if resp.status_code == 429 or resp.status_code >= 500:
+            # Raise with the response attached so the retry wait can read its headers
+            raise requests.HTTPError(f"Tweet post failed: HTTP {resp.status_code}", response=resp)
         if resp.ok:
-            data = resp.json()
+            data = _loads(resp.content)
             tid = (data.get('data') or {}).get('id')
             return tid
         logger.error(f"Tweet post failed: HTTP {resp.status_code}: {resp.text[:200]}")
@@ -4,10 +4,13 @@ Twitter OAuth 2.0 Integration
 Handles OAuth flow for write permissions with callback URL support
 """
 
+import json
 import logging
 import secrets
+import threading
 import base64
 import hashlib
+import hmac
 from typing import Dict, Any, Optional, Tuple
 from urllib.parse import urlencode, urlparse, parse_qs
 import tweepy
@@ -24,7 +27,8 @@ class TwitterOAuth:
                  client_id: str,
                  client_secret: str,
                  callback_url: str,
-                 scopes: list = None):
+                 scopes: list = None,
+                 session: Optional[requests.Session] = None):
         """Initialize OAuth handler"""
         self.client_id = client_id
         self.client_secret = client_secret
@@ -40,6 +44,9 @@ class TwitterOAuth:
         self.auth_url = "https://twitter.com/i/oauth2/authorize"
         self.token_url = "https://api.twitter.com/2/oauth2/token"
         
+        # HTTP session for token requests (shared with the API client when given)
+        self.session = session or requests.Session()
+        
         # PKCE state
         self.code_verifier = None
         self.code_challenge = None
@@ -80,8 +87,10 @@ class TwitterOAuth:
                                 received_state: str) -> Dict[str, Any]:
         """Exchange authorization code for access tokens"""
         
-        # Validate state
-        if received_state != self.state:
+        # Validate state (constant-time comparison); without a started flow there is nothing to match
+        if not self.state:
+            raise ValueError("No OAuth state found - call generate_auth_url first")
+        if not hmac.compare_digest((received_state or "").encode(), self.state.encode()):
             raise ValueError("Invalid state parameter - possible CSRF attack")
         
         if not self.code_verifier:
@@ -104,7 +113,7 @@ class TwitterOAuth:
         }
         
         try:
-            response = requests.post(self.token_url, headers=headers, data=data)
+            response = self.session.post(self.token_url, headers=headers, data=data)
             response.raise_for_status()
             
             tokens = response.json()
@@ -139,7 +148,7 @@ class TwitterOAuth:
         }
         
         try:
-            response = requests.post(self.token_url, headers=headers, data=data)
+            response = self.session.post(self.token_url, headers=headers, data=data)
             response.raise_for_status()
             
             tokens = response.json()
@@ -162,7 +171,7 @@ class TwitterOAuth:
         
         return tweepy.Client(
             bearer_token=access_token,
-            wait_on_rate_limit=True
+            wait_on_rate_limit=False
         )
     
     def validate_tokens(self, tokens: Dict[str, Any]) -> bool:
@@ -187,19 +196,37 @@ class TokenStorage:
     
     def __init__(self, storage_path: str = "tokens.json"):
         self.storage_path = storage_path
+        # Parsed file contents, reused until the file's mtime changes
+        self._cache: Optional[Dict[str, Any]] = None
+        self._cache_mtime: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def _read_all(self) -> Dict[str, Any]:
+        """Return all stored tokens, re-reading the file only when it changed"""
+        try:
+            mtime = os.stat(self.storage_path).st_mtime
+        except FileNotFoundError:
+            self._cache, self._cache_mtime = None, None
+            return {}
+        
+        if self._cache is None or mtime != self._cache_mtime:
+            with open(self.storage_path, 'r') as f:
+                self._cache = json.load(f)
+            self._cache_mtime = mtime
+        return self._cache
+    
+    def _write_all(self, all_tokens: Dict[str, Any]) -> None:
+        """Atomically replace the token file so readers never see a partial write"""
+        tmp_path = f"{self.storage_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(all_tokens, f, indent=2)
+        os.replace(tmp_path, self.storage_path)
+        self._cache = all_tokens
+        self._cache_mtime = os.stat(self.storage_path).st_mtime
     
     def save_tokens(self, user_id: str, tokens: Dict[str, Any]) -> None:
         """Save tokens for a user"""
-        import json
-        
         try:
-            # Load existing tokens
-            if os.path.exists(self.storage_path):
-                with open(self.storage_path, 'r') as f:
-                    all_tokens = json.load(f)
-            else:
-                all_tokens = {}
-            
             # Convert datetime objects to strings
             serializable_tokens = {}
             for key, value in tokens.items():
@@ -208,11 +235,11 @@ class TokenStorage:
                 else:
                     serializable_tokens[key] = value
             
-            # Save tokens for user
-            all_tokens[user_id] = serializable_tokens
-            
-            with open(self.storage_path, 'w') as f:
-                json.dump(all_tokens, f, indent=2)
+            with self._lock:
+                # Save tokens for user
+                all_tokens = dict(self._read_all())
+                all_tokens[user_id] = serializable_tokens
+                self._write_all(all_tokens)
             
             logger.info(f"💾 Saved tokens for user: {user_id}")
             
@@ -221,16 +248,10 @@ class TokenStorage:
     
     def load_tokens(self, user_id: str) -> Optional[Dict[str, Any]]:
         """Load tokens for a user"""
-        import json
-        
         try:
-            if not os.path.exists(self.storage_path):
-                return None
-            
-            with open(self.storage_path, 'r') as f:
-                all_tokens = json.load(f)
-            
-            return all_tokens.get(user_id)
+            with self._lock:
+                tokens = self._read_all().get(user_id)
+            return dict(tokens) if tokens else tokens
             
         except Exception as e:
             logger.error(f"Failed to load tokens: {e}")
@@ -238,22 +259,16 @@ class TokenStorage:
     
     def delete_tokens(self, user_id: str) -> None:
         """Delete tokens for a user"""
-        import json
-        
         try:
-            if not os.path.exists(self.storage_path):
-                return
-            
-            with open(self.storage_path, 'r') as f:
-                all_tokens = json.load(f)
-            
-            if user_id in all_tokens:
-                del all_tokens[user_id]
+            with self._lock:
+                all_tokens = self._read_all()
+                if user_id not in all_tokens:
+                    return
                 
-                with open(self.storage_path, 'w') as f:
-                    json.dump(all_tokens, f, indent=2)
-                
-                logger.info(f"🗑️ Deleted tokens for user: {user_id}")
+                all_tokens = {key: value for key, value in all_tokens.items() if key != user_id}
+                self._write_all(all_tokens)
+            
+            logger.info(f"🗑️ Deleted tokens for user: {user_id}")
                 
         except Exception as e:
             logger.error(f"Failed to delete tokens: {e}")
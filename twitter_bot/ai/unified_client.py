@@ -6,6 +6,7 @@ Provides a unified interface for multiple AI providers (Gemini, Claude, OpenAI)
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from typing import Dict, Any, List, Optional, Protocol
 from abc import ABC, abstractmethod
 from tenacity import retry, stop_after_attempt, wait_exponential
@@ -162,75 +163,10 @@ class ClaudeClient:
     def generate_content(self, prompt: str, output_format: str = "json", **kwargs) -> Dict[str, Any]:
         """Generate content with Claude"""
         try:
-            # Format prompt based on output type
-            if output_format == "text":
-                formatted_prompt = prompt
-            else:
-                formatted_prompt = f"""
-{prompt}
-
-Please respond with valid JSON only. Do not include any text before or after the JSON.
-"""
-            
-            response = self.client.messages.create(
-                model=self.config.model_name,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                messages=[
-                    {"role": "user", "content": formatted_prompt}
-                ]
-            )
+            response = self.client.messages.create(**self._message_params(prompt, output_format))
             
             if response.content and len(response.content) > 0:
-                content_text = response.content[0].text
-                
-                # For text output, return as-is
-                if output_format == "text":
-                    return {"content": content_text}
-                
-                # Clean up Claude's markdown formatting for JSON
-                content_text = content_text.strip()
-                if content_text.startswith('```json'):
-                    content_text = content_text[7:]  # Remove ```json
-                if content_text.startswith('```'):
-                    content_text = content_text[3:]   # Remove ```
-                if content_text.endswith('```'):
-                    content_text = content_text[:-3]  # Remove trailing ```
-                content_text = content_text.strip()
-                
-                try:
-                    return json.loads(content_text)
-                except json.JSONDecodeError as e:
-                    # More robust JSON extraction for Claude responses
-                    import re
-                    try:
-                        # Try to find JSON object patterns
-                        json_patterns = [
-                            r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',  # Simple nested JSON
-                            r'\{[\s\S]*?\}',  # Any JSON-like structure
-                        ]
-                        
-                        for pattern in json_patterns:
-                            matches = re.findall(pattern, content_text)
-                            for match in matches:
-                                try:
-                                    return json.loads(match)
-                                except json.JSONDecodeError:
-                                    continue
-                        
-                        # If no valid JSON found, create structured response
-                        logger.warning(f"Claude returned non-JSON response: {content_text[:100]}...")
-                        return {
-                            "content": content_text,
-                            "ai_provider": "claude", 
-                            "parsed": False,
-                            "fallback": True
-                        }
-                        
-                    except Exception as fallback_e:
-                        logger.error(f"Failed to parse Claude response as JSON with fallback: {e}")
-                        logger.debug(f"Raw content: {repr(content_text[:200])}")
-                        return {"content": content_text, "error": "json_parse_failed"}
+                return self._parse_content(response.content[0].text, output_format)
             else:
                 logger.warning("Empty response from Claude")
                 return {"error": "empty_response"}
@@ -239,6 +175,77 @@ Please respond with valid JSON only. Do not include any text before or after the
             logger.error(f"Claude API error: {e}")
             raise
     
+    def _message_params(self, prompt: str, output_format: str) -> Dict[str, Any]:
+        """Build Messages API parameters for a prompt"""
+        # Format prompt based on output type
+        if output_format == "text":
+            formatted_prompt = prompt
+        else:
+            formatted_prompt = f"""
+{prompt}
+
+Please respond with valid JSON only. Do not include any text before or after the JSON.
+"""
+        
+        return {
+            "model": self.config.model_name,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages": [
+                {"role": "user", "content": formatted_prompt}
+            ]
+        }
+    
+    def _parse_content(self, content_text: str, output_format: str) -> Dict[str, Any]:
+        """Parse Claude response text into the unified result format"""
+        # For text output, return as-is
+        if output_format == "text":
+            return {"content": content_text}
+        
+        # Clean up Claude's markdown formatting for JSON
+        content_text = content_text.strip()
+        if content_text.startswith('```json'):
+            content_text = content_text[7:]  # Remove ```json
+        if content_text.startswith('```'):
+            content_text = content_text[3:]   # Remove ```
+        if content_text.endswith('```'):
+            content_text = content_text[:-3]  # Remove trailing ```
+        content_text = content_text.strip()
+        
+        try:
+            return json.loads(content_text)
+        except json.JSONDecodeError as e:
+            # More robust JSON extraction for Claude responses
+            import re
+            try:
+                # Try to find JSON object patterns
+                json_patterns = [
+                    r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}',  # Simple nested JSON
+                    r'\{[\s\S]*?\}',  # Any JSON-like structure
+                ]
+                
+                for pattern in json_patterns:
+                    matches = re.findall(pattern, content_text)
+                    for match in matches:
+                        try:
+                            return json.loads(match)
+                        except json.JSONDecodeError:
+                            continue
+                
+                # If no valid JSON found, create structured response
+                logger.warning(f"Claude returned non-JSON response: {content_text[:100]}...")
+                return {
+                    "content": content_text,
+                    "ai_provider": "claude", 
+                    "parsed": False,
+                    "fallback": True
+                }
+                
+            except Exception as fallback_e:
+                logger.error(f"Failed to parse Claude response as JSON with fallback: {e}")
+                logger.debug(f"Raw content: {repr(content_text[:200])}")
+                return {"content": content_text, "error": "json_parse_failed"}
+    
     def health_check(self) -> Dict[str, Any]:
         """Test Claude API connectivity"""
         try:
@@ -446,6 +453,38 @@ class UnifiedAIClient:
             logger.error(f"Error generating content with {self.provider.value}: {e}")
             raise
     
+    def generate_batch(self, prompts: Dict[str, str], output_format: str = "json",
+                       timeout: Optional[float] = None, **kwargs) -> Dict[str, Dict[str, Any]]:
+        """Generate content for many prompts, keyed by the same ids as ``prompts``
+        
+        Issues the prompts concurrently and stops waiting after ``timeout``
+        seconds. Failed or timed-out prompts are omitted from the result.
+        """
+        if not prompts:
+            return {}
+        
+        results = {}
+        executor = ThreadPoolExecutor(max_workers=min(len(prompts), 8))
+        try:
+            future_to_id = {
+                executor.submit(self.generate_content, prompt, output_format, **kwargs): custom_id
+                for custom_id, prompt in prompts.items()
+            }
+            for future in as_completed(future_to_id, timeout=timeout):
+                custom_id = future_to_id[future]
+                try:
+                    results[custom_id] = future.result()
+                except Exception as e:
+                    logger.warning(f"Batch prompt {custom_id} failed: {e}")
+        except FuturesTimeoutError:
+            skipped = [custom_id for custom_id in prompts if custom_id not in results]
+            logger.warning(f"Batch prompts timed out after {timeout}s, dropping: {skipped}")
+        finally:
+            # Don't block on stragglers; their results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return results
+    
     def health_check(self) -> Dict[str, Any]:
         """Test current AI provider connectivity"""
         return self.client.health_check()
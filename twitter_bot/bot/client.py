@@ -6,20 +6,23 @@ Unified Twitter automation with AI-powered content and engagement
 
 import logging
 import time
+from operator import itemgetter
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import schedule
 from ai.content_generator import ContentGenerator
 from ai.trend_analyzer import TrendAnalyzer
 from ai.rss_engagement_generator import RSSEngagementGenerator
-from ai.content_source_manager import ContentSourceManager
-from integrations.twitter_api import TwitterAPI
+from ai.content_source_manager import ContentSourceManager, ContentResult
+from integrations.twitter_api import TwitterAPI, TweetRow
 from core.database import session_scope
 from core.content_tracker import ContentTracker
 from api_usage_tracker import APIUsageTracker
 
 logger = logging.getLogger(__name__)
 
+_SCORE_KEY = itemgetter('engagement_score')
+
 class TwitterBotClient:
     """Main Twitter bot automation client"""
     
@@ -238,7 +241,7 @@ class TwitterBotClient:
                 
                 # Force RSS-only discovery
                 content_result = self.content_source_manager._get_rss_reply_opportunity()
-                if content_result.get('success'):
+                if content_result.success:
                     logger.info("✅ Found RSS opportunity, proceeding with reply")
                     return self._handle_rss_reply(content_result)
                 else:
@@ -252,23 +255,23 @@ class TwitterBotClient:
             # Get content from optimal source manager (includes API calls)
             content_result = self.content_source_manager.get_content_for_posting(content_type="engagement")
             
-            if not content_result['success']:
-                logger.info(f"⚠️ Content discovery failed: {content_result['error']}")
+            if not content_result.success:
+                logger.info(f"⚠️ Content discovery failed: {content_result.error}")
                 return {
                     'success': True,
                     'opportunities_found': 0,
                     'engaged': 0,
-                    'source': content_result['source'].value
+                    'source': content_result.source.value
                 }
             
             if dry_run:
                 logger.info("🧪 DRY RUN - Optimal engagement opportunity found but not acted upon")
                 return {
                     'success': True,
-                    'content_result': content_result,
+                    'content_result': content_result.to_dict(),
                     'engaged': False,
                     'dry_run': True,
-                    'source': content_result['source'].value
+                    'source': content_result.source.value
                 }
             
             # Handle different content source types
@@ -282,11 +285,11 @@ class TwitterBotClient:
                 'engaged': False
             }
     
-    def _execute_engagement_strategy(self, content_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_engagement_strategy(self, content_result: ContentResult) -> Dict[str, Any]:
         """Execute the appropriate engagement strategy based on content source"""
         
-        action_type = content_result.get('action_type')
-        source = content_result['source']
+        action_type = content_result.action_type
+        source = content_result.source
         
         if action_type == 'direct_viral_reply':
             return self._handle_viral_reply(content_result)
@@ -299,10 +302,10 @@ class TwitterBotClient:
         else:
             raise Exception(f"Unknown action type: {action_type}")
     
-    def _handle_viral_reply(self, content_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_viral_reply(self, content_result: ContentResult) -> Dict[str, Any]:
         """Handle direct reply to viral tweet"""
         
-        viral_tweet = content_result['viral_tweet']
+        viral_tweet = content_result.viral_tweet
         
         logger.info(f"💬 Replying to viral tweet from @{viral_tweet['author']} (score: {viral_tweet['engagement_score']:.1f})")
         
@@ -372,10 +375,10 @@ class TwitterBotClient:
         else:
             raise Exception("Failed to post viral reply")
     
-    def _handle_inspired_content(self, content_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_inspired_content(self, content_result: ContentResult) -> Dict[str, Any]:
         """Handle RSS-inspired content creation"""
         
-        opportunity = content_result['opportunity']
+        opportunity = content_result.opportunity
         
         # Check if content already used
         if self.content_tracker.has_used_rss_post(
@@ -473,10 +476,10 @@ class TwitterBotClient:
         else:
             raise Exception("Failed to post RSS-inspired tweet")
     
-    def _handle_rss_reply(self, content_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_rss_reply(self, content_result: ContentResult) -> Dict[str, Any]:
         """Handle RSS reply generation (posts actual replies to original tweets)"""
         
-        opportunity = content_result['opportunity']
+        opportunity = content_result.opportunity
         target_user = opportunity['source_username']
         
         # Check if content already used
@@ -570,11 +573,11 @@ class TwitterBotClient:
         else:
             raise Exception("Failed to post RSS-inspired tweet")
     
-    def _handle_trending_content(self, content_result: Dict[str, Any]) -> Dict[str, Any]:
+    def _handle_trending_content(self, content_result: ContentResult) -> Dict[str, Any]:
         """Handle web scraper trending content"""
         
-        trend_topic = content_result['trend_topic']
-        trend_context = content_result.get('trend_context', '')
+        trend_topic = content_result.trend_topic
+        trend_context = content_result.trend_context or ''
         
         logger.info(f"📈 Creating trending content about: {trend_topic}")
         
@@ -642,14 +645,14 @@ class TwitterBotClient:
         else:
             raise Exception("Failed to post trending tweet")
     
-    def _generate_content_from_source(self, content_result: Dict[str, Any], content_pillar: Optional[str]) -> Dict[str, Any]:
+    def _generate_content_from_source(self, content_result: ContentResult, content_pillar: Optional[str]) -> Dict[str, Any]:
         """Generate content based on optimal source result"""
         
-        source = content_result['source']
+        source = content_result.source
         
         if source.value == 'rss_inspiration':
             # Generate content inspired by RSS
-            opportunity = content_result['opportunity']
+            opportunity = content_result.opportunity
             response_content = self.rss_engagement.generate_response_content(opportunity)
             
             ai_response = self.content_generator.ai_client.generate_content(response_content['prompt'])
@@ -666,8 +669,8 @@ class TwitterBotClient:
         
         elif source.value == 'web_scraper_trending':
             # Generate content based on trending topics (standalone posts only)
-            trend_topic = content_result['trend_topic']
-            trend_context = content_result.get('trend_context', '')
+            trend_topic = content_result.trend_topic
+            trend_context = content_result.trend_context or ''
             
             trending_prompt = f"""
             Create a viral standalone Twitter post about this trending topic:
@@ -693,7 +696,7 @@ class TwitterBotClient:
                 return {
                     'content': ai_response['content'].strip(),
                     'content_pillar': content_pillar or 'trending',
-                    'viral_score': content_result.get('viral_potential', 7.5),
+                    'viral_score': content_result.viral_potential or 7.5,
                     'hashtags': self.config.brand.target_hashtags[:2],
                     'source': 'web_scraper_trending',
                     'trend_topic': trend_topic
@@ -813,10 +816,10 @@ class TwitterBotClient:
                         
                         if score > 7.0:  # Only high-quality opportunities
                             opportunity = {
-                                'tweet_id': tweet['id'],
-                                'author': tweet['author']['username'],
-                                'content': tweet['text'],
-                                'created_at': tweet['created_at'],
+                                'tweet_id': tweet.id,
+                                'author': tweet.author_username,
+                                'content': tweet.text,
+                                'created_at': tweet.created_at,
                                 'engagement_score': score,
                                 'search_term': term,
                                 'source': 'twitter_api_legacy'
@@ -835,7 +838,7 @@ class TwitterBotClient:
                         continue
             
             # Sort by engagement score
-            opportunities.sort(key=lambda x: x['engagement_score'], reverse=True)
+            opportunities.sort(key=_SCORE_KEY, reverse=True)
             
             if rate_limit_hit and not opportunities:
                 # If we hit rate limits and found no opportunities, raise an exception
@@ -848,12 +851,12 @@ class TwitterBotClient:
             # Re-raise for the calling method to handle
             raise e
     
-    def _score_engagement_opportunity(self, tweet: Dict[str, Any]) -> float:
+    def _score_engagement_opportunity(self, tweet: TweetRow) -> float:
         """Score an engagement opportunity"""
         score = 5.0  # Base score
         
-        text = tweet.get('text', '').lower()
-        metrics = tweet.get('public_metrics', {})
+        text = tweet.text.lower()
+        metrics = tweet.public_metrics
         
         # Engagement metrics boost
         likes = metrics.get('like_count', 0)
@@ -879,7 +882,7 @@ class TwitterBotClient:
             score += 1.0
         
         # Recency boost
-        created_at = tweet.get('created_at', '')
+        created_at = tweet.created_at
         # Would parse timestamp and boost recent tweets
         
         return min(10.0, score)  # Cap at 10
@@ -4,18 +4,22 @@ Content Tracker with Cosine Similarity
 Tracks used content to prevent duplicates and ensure freshness using semantic similarity
 """
 
+import hashlib
 import logging
 import json
 import re
 import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List, Set, Optional
+from typing import Dict, Any, Iterable, List, Set, Optional, Tuple
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
 
+_EMAIL_RETENTION = timedelta(days=14)
+_THEME_RETENTION = timedelta(hours=6)
+
 class ContentTracker:
     """Tracks used content to prevent duplicates using cosine similarity"""
     
@@ -46,6 +50,17 @@ class ContentTracker:
         # Initialize data structure
         self.data = self._load_tracker_data()
         
+        # In-process dedupe caches: theme -> last used time (None if unused), and
+        # email content digest -> (similarity verdict, time the verdict may change)
+        self._theme_cache: Dict[str, Optional[datetime]] = {}
+        self._email_similarity_cache: Dict[str, tuple] = {}
+        
+        # Oldest stored email content time, kept current on mark/prune so similarity
+        # verdicts know when they expire without re-parsing every timestamp
+        self._oldest_email_time: Optional[datetime] = min(
+            (self._entry_time(item) for item in self.data['email_content']), default=None
+        )
+        
         logger.info("📋 Content Tracker v2 initialized with cosine similarity")
     
     def _load_tracker_data(self) -> Dict[str, Any]:
@@ -72,6 +87,29 @@ class ContentTracker:
                 'content_themes': {}
             }
     
+    @staticmethod
+    def _entry_time(item: Dict[str, Any]) -> datetime:
+        """Timestamp of a stored content entry"""
+        return datetime.fromisoformat(item.get('timestamp', '2025-01-01T00:00:00'))
+    
+    def _prune_email_content(self, now: datetime):
+        """Drop expired email content; a no-op until the oldest entry passes retention"""
+        oldest = self._oldest_email_time
+        cutoff = now - _EMAIL_RETENTION
+        if oldest is None or oldest >= cutoff:
+            return
+        
+        kept = []
+        oldest = None
+        for item in self.data['email_content']:
+            timestamp = self._entry_time(item)
+            if timestamp >= cutoff:
+                kept.append(item)
+                if oldest is None or timestamp < oldest:
+                    oldest = timestamp
+        self.data['email_content'] = kept
+        self._oldest_email_time = oldest
+    
     def _save_tracker_data(self):
         """Save tracking data to file"""
         try:
@@ -142,20 +180,22 @@ class ContentTracker:
         retention_periods = {
             'replied_tweets': timedelta(days=30),
             'used_rss_posts': timedelta(days=7),
-            'email_content': timedelta(days=14),
+            'email_content': _EMAIL_RETENTION,
             'posted_content': timedelta(days=30),
-            'content_themes': timedelta(hours=6)
+            'content_themes': _THEME_RETENTION
         }
         
         for content_type, retention_period in retention_periods.items():
             if content_type in self.data:
                 cutoff_time = now - retention_period
                 
-                if content_type in ['email_content', 'posted_content']:
+                if content_type == 'email_content':
+                    self._prune_email_content(now)
+                elif content_type == 'posted_content':
                     # List structure: filter by timestamp
                     self.data[content_type] = [
                         item for item in self.data[content_type]
-                        if datetime.fromisoformat(item.get('timestamp', '2025-01-01T00:00:00')) >= cutoff_time
+                        if self._entry_time(item) >= cutoff_time
                     ]
                 else:
                     # Dict structure: remove old keys
@@ -170,6 +210,8 @@ class ContentTracker:
                     
                     for key in old_keys:
                         del self.data[content_type][key]
+                        if content_type == 'content_themes':
+                            self._theme_cache.pop(key, None)
     
     # Posted Content Tracking with Cosine Similarity
     def has_posted_similar_content(self, content: str, content_type: str = "", context: str = "") -> bool:
@@ -217,6 +259,24 @@ class ContentTracker:
     # Email Content Tracking with Cosine Similarity
     def has_generated_similar_email(self, content: str, content_type: str = "", context: str = "") -> bool:
         """Check if we've generated similar email content recently using cosine similarity"""
+        now = datetime.now()
+        self._prune_email_content(now)
+        cache_key = hashlib.sha1(f"{content}\0{context}".encode('utf-8', 'ignore')).hexdigest()
+        cached = self._email_similarity_cache.get(cache_key)
+        if cached is not None and now < cached[1]:
+            return cached[0]
+        
+        is_similar = self._check_similar_email(content, context)
+        
+        # The verdict holds until new email content is marked or the oldest entry expires
+        oldest = self._oldest_email_time
+        valid_until = oldest + _EMAIL_RETENTION if oldest is not None else datetime.max
+        self._email_similarity_cache[cache_key] = (is_similar, valid_until)
+        
+        return is_similar
+    
+    def _check_similar_email(self, content: str, context: str) -> bool:
+        """Run the cosine similarity check against stored email content"""
         self._clean_old_entries()
         
         # Classify content type
@@ -244,16 +304,20 @@ class ContentTracker:
     def mark_email_content_generated(self, content: str, content_type: str = "", context: str = ""):
         """Mark email content as generated with full content storage"""
         classified_type = self._classify_content_type(content, context)
+        now = datetime.now()
         
         content_entry = {
             'content': content,
             'content_type': classified_type,
             'original_type': content_type,
             'context': context,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
         
         self.data['email_content'].append(content_entry)
+        if self._oldest_email_time is None:
+            self._oldest_email_time = now
+        self._email_similarity_cache.clear()
         self._save_tracker_data()
         logger.debug(f"📋 Marked email content as generated (type: {classified_type})")
     
@@ -278,15 +342,30 @@ class ContentTracker:
         
         return tweet_id in self.data['replied_tweets']
     
+    def has_replied_to_tweets(self, tweet_ids: Iterable[str]) -> Set[str]:
+        """Return the subset of tweet IDs we've already replied to"""
+        replied_tweets = self.data.setdefault('replied_tweets', {})
+        return {tweet_id for tweet_id in tweet_ids if tweet_id in replied_tweets}
+    
+    @staticmethod
+    def _rss_post_key(username: str, content: str) -> str:
+        """Storage key for an RSS post"""
+        return f"{username}:{hash(content) % 10000000}"
+    
     def has_used_rss_post(self, username: str, content: str) -> bool:
         """Check if RSS post has been used"""
         self._clean_old_entries()
-        content_hash = f"{username}:{hash(content) % 10000000}"
-        return content_hash in self.data['used_rss_posts']
+        return self._rss_post_key(username, content) in self.data['used_rss_posts']
+    
+    def has_used_rss_posts(self, posts: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Return the subset of (username, content) RSS posts that have been used"""
+        self._clean_old_entries()
+        used_rss_posts = self.data['used_rss_posts']
+        return {post for post in posts if self._rss_post_key(*post) in used_rss_posts}
     
     def mark_rss_post_used(self, username: str, content: str):
         """Mark RSS post as used"""
-        content_hash = f"{username}:{hash(content) % 10000000}"
+        content_hash = self._rss_post_key(username, content)
         self.data['used_rss_posts'][content_hash] = datetime.now().isoformat()
         self._save_tracker_data()
         logger.debug(f"📋 Marked RSS post from {username} as used")
@@ -294,16 +373,26 @@ class ContentTracker:
     # Theme tracking (keep existing)
     def has_used_theme_recently(self, theme: str, timeframe_hours: int = 6) -> bool:
         """Check if we've used this theme/topic recently"""
-        self._clean_old_entries()
-        if theme in self.data['content_themes']:
-            theme_time = datetime.fromisoformat(self.data['content_themes'][theme])
-            time_diff = datetime.now() - theme_time
-            return time_diff.total_seconds() < (timeframe_hours * 3600)
-        return False
+        if theme in self._theme_cache:
+            theme_time = self._theme_cache[theme]
+        else:
+            self._clean_old_entries()
+            timestamp = self.data['content_themes'].get(theme)
+            theme_time = datetime.fromisoformat(timestamp) if timestamp else None
+            self._theme_cache[theme] = theme_time
+        
+        if theme_time is None:
+            return False
+        
+        # Themes older than the retention period count as unused, as if cleaned
+        time_diff = datetime.now() - theme_time
+        return time_diff.total_seconds() < min(timeframe_hours * 3600, _THEME_RETENTION.total_seconds())
     
     def mark_theme_used(self, theme: str):
         """Mark theme as recently used"""
-        self.data['content_themes'][theme] = datetime.now().isoformat()
+        now = datetime.now()
+        self.data['content_themes'][theme] = now.isoformat()
+        self._theme_cache[theme] = now
         self._save_tracker_data()
         logger.debug(f"📋 Marked theme '{theme}' as used")
     
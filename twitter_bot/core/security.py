@@ -5,49 +5,234 @@ Handles encryption, secret management, and security policies
 """
 
 import os
+import re
 import hashlib
-import secrets
-from typing import Optional, Dict, Any
-from cryptography.fernet import Fernet
+import hmac
+from types import MappingProxyType
+from typing import Optional, Dict, Any, Mapping
+from cryptography.fernet import Fernet, InvalidToken
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-import base64
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import logging
+import threading
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
+from functools import cached_property
+
+try:
+    import pybase64 as base64  # SIMD-accelerated, API-compatible with stdlib base64
+except ImportError:
+    import base64
 
 logger = logging.getLogger(__name__)
 
+# Derived master keys keyed by (sha256(password), iterations); the raw
+# password is never used as a cache key
+_DERIVED_KEY_CACHE: Dict[tuple, bytes] = {}
+
+def _derive_key(password_bytes: bytes, iterations: int = 100000) -> bytes:
+    """Derive a 32-byte master key from a password, once per process and password.
+    
+    hashlib.pbkdf2_hmac releases the GIL for the whole OpenSSL derivation, so
+    managers built from a thread pool derive their keys in parallel across
+    cores. No lock is held around the KDF for the same reason; two threads
+    racing on the same password both compute the same key, which is harmless.
+    """
+    pw_digest = hashlib.sha256(password_bytes).digest()
+    cache_key = (pw_digest, iterations)
+    key = _DERIVED_KEY_CACHE.get(cache_key)
+    if key is None:
+        # Use first 16 bytes of the digest as salt; hashlib hands the whole
+        # derivation to OpenSSL's PKCS5_PBKDF2_HMAC
+        key = hashlib.pbkdf2_hmac("sha256", password_bytes, pw_digest[:16], iterations, 32)
+        _DERIVED_KEY_CACHE[cache_key] = key
+    return key
+
+def _derive_key_hkdf(key_bytes: bytes) -> bytes:
+    """Derive a 32-byte master key from an already high-entropy secret.
+    
+    A single HKDF-SHA256 extract/expand; no stretching is needed when the
+    input is machine-generated (e.g. from generate_secure_token).
+    """
+    salt = hashlib.sha256(key_bytes).digest()[:16]
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=salt, info=b"fernet").derive(key_bytes)
+
+# Injection markers rejected by validate_input, matched in a single pass
+_DANGEROUS_PATTERNS = (
+    '<script', 'javascript:', 'data:', 'vbscript:',
+    'onload=', 'onerror=', 'onclick=', '<?php', '<%',
+    'exec(', 'eval(', '__import__'
+)
+_DANGEROUS_RE = re.compile("|".join(re.escape(p) for p in _DANGEROUS_PATTERNS))
+_DANGEROUS_BYTES_RE = re.compile(b"|".join(re.escape(p.encode("ascii")) for p in _DANGEROUS_PATTERNS))
+
+# A-Z -> a-z applied to encoded ASCII input, which avoids the Unicode-aware str.lower() copy
+_ASCII_LOWER_TABLE = bytes.maketrans(bytes(range(0x41, 0x5B)), bytes(range(0x61, 0x7B)))
+
+# Key names treated as secrets by sanitize_for_logging
+_SENSITIVE_KEYS = frozenset({
+    'password', 'secret', 'key', 'token', 'api_key',
+    'access_token', 'bearer_token', 'smtp_password'
+})
+_SENSITIVE_KEY_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(_SENSITIVE_KEYS, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+# Settings that must not be enabled in production, checked by audit_configuration
+_DANGEROUS_DEV_SETTINGS = MappingProxyType({
+    'debug': True,
+    'echo': True,
+    'development': True
+})
+
+# API key formats by key type; unknown types use the generic rule
+_API_KEY_PATTERNS = {
+    # Twitter API keys are typically 25+ characters
+    "twitter": re.compile(r"\A.{25,}\Z", re.DOTALL),
+    # Gemini API keys start with AIza
+    "gemini": re.compile(r"\AAIza[0-9A-Za-z_-]{28,}\Z"),
+    "generic": re.compile(r"\A.{10,}\Z", re.DOTALL),
+}
+
+# Security headers for web responses; read-only so callers cannot mutate the shared copy
+_SECURITY_HEADERS: Mapping[str, str] = MappingProxyType({
+    'X-Content-Type-Options': 'nosniff',
+    'X-Frame-Options': 'DENY',
+    'X-XSS-Protection': '1; mode=block',
+    'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
+    'Content-Security-Policy': "default-src 'self'",
+    'Referrer-Policy': 'strict-origin-when-cross-origin'
+})
+
+class _FilenameTable(dict):
+    """str.translate table that keeps safe filename characters and drops the rest.
+    
+    Unsafe code points are remembered on first sight (up to a bound) so later
+    lookups stay in C.
+    """
+    
+    max_entries = 4096
+    
+    def __missing__(self, codepoint: int) -> None:
+        if len(self) < self.max_entries:
+            self[codepoint] = None
+        return None
+
+_FILENAME_TABLE = _FilenameTable(
+    (ord(c), c) for c in "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_."
+)
+
+def _mask_value(value: Any) -> str:
+    """Mask a sensitive value for logging: first and last 4 characters, hashed middle"""
+    if not isinstance(value, str) or not value:
+        return "***REDACTED***"
+    if len(value) < 8:
+        return "****"
+    
+    # Show first 4 and last 4 characters, hash the middle
+    digest = hashlib.blake2b(value[4:-4].encode(), digest_size=4).hexdigest()
+    return f"{value[:4]}***{digest}***{value[-4:]}"
+
+def _audit_setting(key: str, value: Any) -> Optional[str]:
+    """Return the audit issue for one configuration entry, if any"""
+    key_lower = key.lower()
+    
+    # Check for weak secrets
+    if 'secret' in key_lower or 'key' in key_lower:
+        if isinstance(value, str) and len(value) < 32:
+            return "Secret too short (< 32 characters)"
+    
+    # Check for development settings in production
+    if key_lower in _DANGEROUS_DEV_SETTINGS and value == _DANGEROUS_DEV_SETTINGS[key_lower]:
+        return "Development setting enabled in production"
+    
+    return None
+
+class _TokenPool:
+    """Hands out CSPRNG bytes from a pre-filled os.urandom buffer.
+    
+    One getrandom() call serves many tokens. Bytes are never handed out
+    twice, and the buffer is discarded in forked children so parent and child
+    cannot produce the same tokens.
+    """
+    
+    def __init__(self, size: int = 4096):
+        self._size = size
+        self._reset()
+    
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._buffer = b""
+        self._offset = 0
+    
+    def take(self, n: int) -> bytes:
+        """Return n fresh random bytes"""
+        if n > self._size:
+            return os.urandom(n)
+        with self._lock:
+            if self._offset + n > len(self._buffer):
+                self._buffer = os.urandom(self._size)
+                self._offset = 0
+            chunk = self._buffer[self._offset:self._offset + n]
+            self._offset += n
+            return chunk
+
+_TOKEN_POOL = _TokenPool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_TOKEN_POOL._reset)
+
 class SecurityManager:
     """Manages security policies and encryption"""
     
-    def __init__(self, secret_key: str, encryption_key: Optional[str] = None):
-        """Initialize security manager"""
+    def __init__(self, secret_key: str, encryption_key: Optional[str] = None,
+                 encryption_key_is_high_entropy: bool = False):
+        """Initialize security manager.
+        
+        By default encryption_key is treated as a password and stretched with
+        100k rounds of PBKDF2. Set encryption_key_is_high_entropy=True only for
+        random machine-generated keys (32+ bytes from a CSPRNG); those are
+        expanded with a single HKDF pass instead. The two modes derive
+        different keys, so data must be read back with the mode it was written
+        with.
+        """
         self.secret_key = secret_key
         self.encryption_key = encryption_key
-        self._rate_limits = defaultdict(list)
+        self.encryption_key_is_high_entropy = encryption_key_is_high_entropy
+        self._rate_limits = defaultdict(deque)
         
-        # Initialize encryption
-        if encryption_key:
-            self.cipher = self._create_cipher(encryption_key)
-        else:
-            self.cipher = None
+        # Ciphers are created on first use so processes that never encrypt
+        # skip the key derivation
+        if not encryption_key:
             logger.warning("No encryption key provided - sensitive data will not be encrypted")
     
+    @cached_property
+    def cipher(self) -> Optional[Fernet]:
+        """Fernet cipher for encrypt_string/decrypt_string"""
+        return self._create_cipher(self.encryption_key) if self.encryption_key else None
+    
+    @cached_property
+    def aead(self) -> Optional[AESGCM]:
+        """AES-GCM cipher for encrypt_bytes/decrypt_bytes"""
+        return self._create_aead(self.encryption_key) if self.encryption_key else None
+    
+    def _master_key(self, password: str) -> bytes:
+        """Derive the master key for the configured key-stretching mode"""
+        if self.encryption_key_is_high_entropy:
+            return _derive_key_hkdf(password.encode())
+        # Generate key from password (derived once per process and password)
+        return _derive_key(password.encode())
+    
     def _create_cipher(self, password: str) -> Fernet:
         """Create encryption cipher from password"""
-        # Generate key from password
-        password_bytes = password.encode()
-        salt = hashlib.sha256(password_bytes).digest()[:16]  # Use first 16 bytes as salt
-        
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
-        return Fernet(key)
+        return Fernet(base64.urlsafe_b64encode(self._master_key(password)))
+    
+    def _create_aead(self, password: str) -> AESGCM:
+        """Create the AES-256-GCM cipher used by encrypt_bytes/decrypt_bytes"""
+        # Separate subkey so Fernet and AES-GCM never share key material
+        master_key = self._master_key(password)
+        return AESGCM(hmac.new(master_key, b"aes-gcm", hashlib.sha256).digest())
     
     def encrypt_string(self, data: str) -> str:
         """Encrypt a string"""
@@ -56,8 +241,8 @@ class SecurityManager:
             return data
         
         try:
-            encrypted = self.cipher.encrypt(data.encode())
-            return base64.urlsafe_b64encode(encrypted).decode()
+            # Fernet tokens are already url-safe base64 text
+            return self.cipher.encrypt(data.encode()).decode("ascii")
         except Exception as e:
             logger.error(f"Encryption failed: {e}")
             return data
@@ -69,86 +254,88 @@ class SecurityManager:
             return encrypted_data
         
         try:
-            encrypted_bytes = base64.urlsafe_b64decode(encrypted_data.encode())
-            decrypted = self.cipher.decrypt(encrypted_bytes)
+            token = encrypted_data.encode("ascii")
+            try:
+                decrypted = self.cipher.decrypt(token)
+            except InvalidToken:
+                # Older values were base64-encoded a second time
+                decrypted = self.cipher.decrypt(base64.urlsafe_b64decode(token))
             return decrypted.decode()
         except Exception as e:
             logger.error(f"Decryption failed: {e}")
             return encrypted_data
     
-    def hash_api_key(self, api_key: str) -> str:
-        """Create a secure hash of an API key for logging"""
-        if len(api_key) < 8:
-            return "****"
+    def encrypt_bytes(self, data: bytes) -> bytes:
+        """Encrypt bytes for internal at-rest storage.
         
-        # Show first 4 and last 4 characters, hash the middle
-        start = api_key[:4]
-        end = api_key[-4:]
-        middle_hash = hashlib.sha256(api_key[4:-4].encode()).hexdigest()[:8]
+        Output is ``nonce (12 bytes) || AES-GCM ciphertext``: no base64, no
+        Fernet framing. Use encrypt_string for tokens shared with other systems.
+        """
+        if not self.aead:
+            logger.warning("No encryption available - returning plain bytes")
+            return data
         
-        return f"{start}***{middle_hash}***{end}"
+        try:
+            nonce = os.urandom(12)
+            return nonce + self.aead.encrypt(nonce, data, None)
+        except Exception as e:
+            logger.error(f"Encryption failed: {e}")
+            return data
+    
+    def decrypt_bytes(self, encrypted_data: bytes) -> bytes:
+        """Decrypt bytes produced by encrypt_bytes"""
+        if not self.aead:
+            logger.warning("No encryption available - returning data as-is")
+            return encrypted_data
+        
+        try:
+            return self.aead.decrypt(encrypted_data[:12], encrypted_data[12:], None)
+        except Exception as e:
+            logger.error(f"Decryption failed: {e}")
+            return encrypted_data
+    
+    def hash_api_key(self, api_key: str) -> str:
+        """Create a secure hash of an API key for logging"""
+        return _mask_value(api_key)
     
     def validate_api_key_format(self, api_key: str, key_type: str = "generic") -> bool:
         """Validate API key format"""
         if not api_key:
             return False
         
-        # Basic validation
-        if len(api_key) < 10:
-            return False
-        
-        # Type-specific validation
-        if key_type == "twitter":
-            # Twitter API keys are typically 25+ characters
-            return len(api_key) >= 25
-        elif key_type == "gemini":
-            # Gemini API keys start with AIza
-            return api_key.startswith("AIza") and len(api_key) >= 32
-        
-        return True
+        pattern = _API_KEY_PATTERNS.get(key_type, _API_KEY_PATTERNS["generic"])
+        return pattern.match(api_key) is not None
     
     def check_rate_limit(self, identifier: str, limit_per_hour: int = 100) -> bool:
         """Check if request is within rate limit"""
-        current_time = time.time()
+        # Monotonic timestamps keep each deque sorted oldest-first
+        current_time = time.monotonic()
         hour_ago = current_time - 3600
+        timestamps = self._rate_limits[identifier]
         
         # Clean old entries
-        self._rate_limits[identifier] = [
-            timestamp for timestamp in self._rate_limits[identifier]
-            if timestamp > hour_ago
-        ]
+        while timestamps and timestamps[0] <= hour_ago:
+            timestamps.popleft()
         
         # Check limit
-        if len(self._rate_limits[identifier]) >= limit_per_hour:
+        if len(timestamps) >= limit_per_hour:
             logger.warning(f"Rate limit exceeded for {identifier}")
             return False
         
         # Record this request
-        self._rate_limits[identifier].append(current_time)
+        timestamps.append(current_time)
         return True
     
     def generate_secure_token(self, length: int = 32) -> str:
-        """Generate a secure random token"""
-        return secrets.token_urlsafe(length)
+        """Generate a secure random token (same format as secrets.token_urlsafe)"""
+        return base64.urlsafe_b64encode(_TOKEN_POOL.take(length)).rstrip(b"=").decode("ascii")
     
     def sanitize_for_logging(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Sanitize sensitive data for logging"""
-        sanitized = {}
-        sensitive_keys = {
-            'password', 'secret', 'key', 'token', 'api_key', 
-            'access_token', 'bearer_token', 'smtp_password'
+        return {
+            key: _mask_value(value) if _SENSITIVE_KEY_RE.search(key) else value
+            for key, value in data.items()
         }
-        
-        for key, value in data.items():
-            if any(sensitive in key.lower() for sensitive in sensitive_keys):
-                if isinstance(value, str) and value:
-                    sanitized[key] = self.hash_api_key(value)
-                else:
-                    sanitized[key] = "***REDACTED***"
-            else:
-                sanitized[key] = value
-        
-        return sanitized
     
     def validate_input(self, data: str, max_length: int = 1000) -> bool:
         """Validate user input for security"""
@@ -160,26 +347,25 @@ class SecurityManager:
             logger.warning(f"Input too long: {len(data)} > {max_length}")
             return False
         
-        # Check for potential injection attempts
-        dangerous_patterns = [
-            '<script', 'javascript:', 'data:', 'vbscript:',
-            'onload=', 'onerror=', 'onclick=', '<?php', '<%',
-            'exec(', 'eval(', '__import__'
-        ]
-        
-        data_lower = data.lower()
-        for pattern in dangerous_patterns:
-            if pattern in data_lower:
-                logger.warning(f"Dangerous pattern detected: {pattern}")
-                return False
+        # Check for potential injection attempts; ASCII input (the common case)
+        # is lowercased and scanned as bytes
+        try:
+            match = _DANGEROUS_BYTES_RE.search(data.encode("ascii").translate(_ASCII_LOWER_TABLE))
+        except UnicodeEncodeError:
+            match = _DANGEROUS_RE.search(data.lower())
+        if match:
+            pattern = match.group()
+            if isinstance(pattern, bytes):
+                pattern = pattern.decode("ascii")
+            logger.warning(f"Dangerous pattern detected: {pattern}")
+            return False
         
         return True
     
     def secure_filename(self, filename: str) -> str:
         """Create a secure filename"""
         # Remove dangerous characters
-        safe_chars = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-_."
-        safe_filename = ''.join(c for c in filename if c in safe_chars)
+        safe_filename = filename.translate(_FILENAME_TABLE)
         
         # Ensure it's not empty and not too long
         if not safe_filename:
@@ -189,16 +375,9 @@ class SecurityManager:
         
         return safe_filename
     
-    def get_security_headers(self) -> Dict[str, str]:
+    def get_security_headers(self) -> Mapping[str, str]:
         """Get security headers for web responses"""
-        return {
-            'X-Content-Type-Options': 'nosniff',
-            'X-Frame-Options': 'DENY',
-            'X-XSS-Protection': '1; mode=block',
-            'Strict-Transport-Security': 'max-age=31536000; includeSubDomains',
-            'Content-Security-Policy': "default-src 'self'",
-            'Referrer-Policy': 'strict-origin-when-cross-origin'
-        }
+        return _SECURITY_HEADERS
     
     def log_security_event(self, event_type: str, details: Dict[str, Any]):
         """Log security-related events"""
@@ -207,24 +386,8 @@ class SecurityManager:
     
     def audit_configuration(self, config_dict: Dict[str, Any]) -> Dict[str, str]:
         """Audit configuration for security issues"""
-        issues = {}
-        
-        # Check for weak secrets
-        for key, value in config_dict.items():
-            if 'secret' in key.lower() or 'key' in key.lower():
-                if isinstance(value, str) and len(value) < 32:
-                    issues[key] = "Secret too short (< 32 characters)"
-        
-        # Check for development settings in production
-        dangerous_dev_settings = {
-            'debug': True,
-            'echo': True,
-            'development': True
+        return {
+            key: issue
+            for key, value in config_dict.items()
+            if (issue := _audit_setting(key, value)) is not None
         }
-        
-        for key, value in config_dict.items():
-            if key.lower() in dangerous_dev_settings:
-                if value == dangerous_dev_settings[key.lower()]:
-                    issues[key] = "Development setting enabled in production"
-        
-        return issues
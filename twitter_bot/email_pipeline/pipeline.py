@@ -4,26 +4,142 @@ Email Content Pipeline
 Unified email automation with AI-powered content suggestions
 """
 
+import hashlib
+import json
 import logging
+import random
 import schedule
+import textwrap
+import threading
 import time
+from string import Template
 from typing import Dict, Any, List, Optional
-from datetime import datetime
-import pytz
+from dataclasses import dataclass, asdict
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
 from ai.content_generator import ContentGenerator
 from ai.trend_analyzer import TrendAnalyzer
+from ai.rss_engagement_generator import RSSEngagementGenerator
+from ai.reply_cache import ReplyCache
 from .smtp_client import SMTPClient
 from .profile_analyzer import ProfileAnalyzer
 from core.content_tracker import ContentTracker
+from api_usage_tracker import APIUsageTracker
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps_sorted(obj: Any) -> str:
+    """Serialize to canonical compact JSON with sorted keys"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+# Profiles covered by our RSS feeds; Twitter API opportunities are limited to these
+_RSS_AUTHORS = frozenset({
+    'sama', 'naval', 'AndrewYNg', 'alliekmiller', 'mattshumer_', 'balajis', 'ylecun', 'paulg', 'levelsio'
+})
+
+# Content pillar by IST hour for strategic distribution throughout the day
+_PILLAR_BY_HOUR = (
+    ("interactive",) * 6       # 0-5: Late night: Interactive content
+    + ("educational",) * 4     # 6-9: Morning: Educational content
+    + ("insight",) * 5         # 10-14: Midday: Industry insights
+    + ("personal",) * 4        # 15-18: Afternoon: Personal stories
+    + ("educational",) * 3     # 19-21: Evening: More educational
+    + ("interactive",) * 2     # 22-23: Late night: Interactive content
+)
+
+# Next peak posting time for tech/SaaS audience (IST) by current IST hour
+_OPTIMAL_TIME_BY_HOUR = (
+    ("9:00 AM IST",) * 6
+    + ("9:00 AM IST", "10:00 AM IST", "11:00 AM IST")
+    + ("2:00 PM IST",) * 3
+    + ("5:00 PM IST",) * 3
+    + ("7:00 PM IST", "7:00 PM IST", "9:00 PM IST", "9:00 PM IST")
+    + ("Next day 9:00 AM IST",) * 5
+)
+
+# Post fields that identify an email for duplicate detection
+_POST_HASH_FIELDS = attrgetter('content', 'viral_score', 'pillar')
+
+# Seconds Step 4 (combined call plus per-tweet fallback) may spend on contextual replies
+_REPLY_TIMEOUT_SECONDS = 15
+
+# Contextual reply prompt, filled in per engagement opportunity
+_REPLY_PROMPT_TMPL = Template(textwrap.dedent("""
+    Generate 2 unique, contextual replies to this specific tweet by $author_name:
+    
+    Original Tweet: "$tweet_content"
+    
+    Requirements:
+    - Reply must be SPECIFIC to the content above
+    - Include personal SaaS/startup experience relevant to their point
+    - Ask a follow-up question related to their specific message
+    - Avoid generic responses
+    - Keep under 280 characters
+    - Sound like Rakesh Roushan (SaaS expert with practical experience)
+    
+    Generate 2 different reply approaches:
+    1. Personal experience + specific question
+    2. Contrarian insight + follow-up
+    """))
+
+# Combined prompt asking for contextual replies to several tweets in a single call
+_BATCH_REPLY_PROMPT_TMPL = Template(textwrap.dedent("""
+    Generate 2 unique, contextual replies for EACH of the tweets below.
+    
+    $tweets
+    
+    Requirements for every reply:
+    - Reply must be SPECIFIC to that tweet's content
+    - Include personal SaaS/startup experience relevant to their point
+    - Ask a follow-up question related to their specific message
+    - Avoid generic responses
+    - Keep under 280 characters
+    - Sound like Rakesh Roushan (SaaS expert with practical experience)
+    
+    Reply approaches:
+    1. Personal experience + specific question
+    2. Contrarian insight + follow-up
+    
+    Return a JSON object of the form:
+    {"replies": [{"id": "<tweet id>", "reply_1": "<approach 1>", "reply_2": "<approach 2>"}]}
+    """))
+
+@dataclass(slots=True)
+class PostSuggestion:
+    """A formatted post option for the content suggestion email"""
+    option_number: int
+    pillar: str
+    framework: str
+    content: str
+    suggested_time: str
+    hashtags: List[str]
+    engagement_strategy: str
+    viral_score: float
+    trending_inspiration: str
+    viral_potential: str
+    viral_explanation: str
+    ai_model: str
+    character_count: int
+    is_thread: bool = False
+    thread_count: int = 1
+
 class EmailPipeline:
     """AI-powered email content pipeline"""
     
-    def __init__(self, config):
+    def __init__(self, config, state_file: str = "email_pipeline_state.json"):
         """Initialize email pipeline"""
         self.config = config
+        self.state_file = Path(state_file)
         
         # Validate required configurations
         if not config.email.is_valid():
@@ -48,33 +164,47 @@ class EmailPipeline:
         # Initialize content tracker to prevent duplicates
         self.content_tracker = ContentTracker()
         
+        # Engagement opportunity sources: RSS feeds, plus Twitter API reads while quota remains
+        self.rss_engagement = RSSEngagementGenerator(config, self.content_tracker)
+        self.api_tracker = APIUsageTracker()
+        
+        # Reuse contextual replies across near-duplicate tweets
+        self.reply_cache = ReplyCache()
+        
+        # Fallback posts if AI generation fails, built once for the brand
+        self._fallback_post, self._fallback_alt_posts = self._build_fallback_posts(config.brand)
+        
         # IST timezone for scheduling
-        self.ist = pytz.timezone('Asia/Kolkata')
+        self.ist = ZoneInfo('Asia/Kolkata')
         
         # Pipeline state
-        self.is_running = False
-        self.emails_sent_today = 0
+        self._stop_event = threading.Event()
+        self._stop_event.set()
         self.max_daily_emails = 18
         
+        # Daily send counts persisted across restarts, keyed by email day
+        self._daily_counts = self._load_daily_counts()
+        
         logger.info("📧 Email Pipeline initialized with AI-powered content")
     
+    @property
+    def is_running(self) -> bool:
+        """Whether the scheduler loop is active"""
+        return not self._stop_event.is_set()
+    
     def start_scheduler(self):
         """Start automated email scheduling"""
-        self.is_running = True
+        self._stop_event.clear()
         
         logger.info("📅 Starting Email Pipeline Scheduler")
         logger.info("📧 AI-powered emails will be sent hourly from 6 AM to 12 AM IST")
         
-        # Schedule hourly emails from 6 AM to 12 AM IST
-        for hour in range(6, 24):  # 6 AM to 11 PM
-            schedule_time = f"{hour:02d}:00"
-            schedule.every().day.at(schedule_time).do(self._scheduled_email_task)
-            
-        # Also schedule for midnight (00:00 = 12 AM)
-        schedule.every().day.at("00:00").do(self._scheduled_email_task)
+        # Schedule hourly emails; _scheduled_email_task skips hours outside 6 AM to 12 AM IST
+        schedule.every().hour.at(":00").do(self._scheduled_email_task)
         
-        # Daily reset at 1 AM
-        schedule.every().day.at("01:00").do(self._daily_reset)
+        # Keep the persistent SMTP connection alive between hourly emails
+        if hasattr(self.smtp_client, 'keepalive'):
+            schedule.every(5).minutes.do(self.smtp_client.keepalive)
         
         logger.info(f"📅 Scheduled {self.max_daily_emails} daily emails")
         
@@ -82,11 +212,12 @@ class EmailPipeline:
         logger.info("📧 Sending initial AI-powered email...")
         self.send_content_email()
         
-        # Run scheduler loop
+        # Run scheduler loop, sleeping until the next job (capped) so stop() wakes it immediately
         try:
-            while self.is_running:
+            while not self._stop_event.is_set():
                 schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                delay = min(schedule.idle_seconds() or 60, 60)
+                self._stop_event.wait(timeout=max(delay, 1))
                 
         except KeyboardInterrupt:
             logger.info("🛑 Email pipeline stopped by user")
@@ -94,7 +225,9 @@ class EmailPipeline:
     
     def stop(self):
         """Stop the email pipeline"""
-        self.is_running = False
+        self._stop_event.set()
+        if hasattr(self.smtp_client, 'close'):
+            self.smtp_client.close()
         logger.info("🛑 Email Pipeline stopped")
     
     def send_content_email(self) -> bool:
@@ -102,6 +235,7 @@ class EmailPipeline:
         
         try:
             current_time = datetime.now(self.ist)
+            hour = current_time.hour
             logger.info(f"🧠 Generating AI-powered content for {current_time.strftime('%I:%M %p IST')}")
             
             # Check daily limit
@@ -109,139 +243,83 @@ class EmailPipeline:
                 logger.warning("Daily email limit reached")
                 return False
             
-            # Step 1: Analyze trending topics with AI
-            trends = self.trend_analyzer.analyze_current_trends()
-            top_trend = None
-            if trends and 'ai_analysis' in trends:
-                ai_analysis = trends['ai_analysis']
-                if 'top_opportunities' in ai_analysis and ai_analysis['top_opportunities']:
-                    top_trend = ai_analysis['top_opportunities'][0]
-                    logger.info(f"📈 Top trending opportunity: {top_trend.get('trend_topic', 'AI-identified trend')}")
-            
-            # Step 2: Generate AI-powered post suggestions (3 options)
-            trending_context = top_trend.get('trend_topic') if top_trend else None
-            ai_posts = self.content_generator.generate_viral_posts(
-                content_pillar=self._get_hourly_content_pillar(),
-                trending_context=trending_context,
-                count=3
-            )
+            # Steps 1 and 3 are independent network calls, so run engagement discovery
+            # while trends are analyzed and posts are generated
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                engagement_future = executor.submit(self._discover_engagement_opportunities)
+                
+                # Step 1: Analyze trending topics with AI
+                trends = self.trend_analyzer.analyze_current_trends()
+                top_trend = None
+                if trends and 'ai_analysis' in trends:
+                    ai_analysis = trends['ai_analysis']
+                    if 'top_opportunities' in ai_analysis and ai_analysis['top_opportunities']:
+                        top_trend = ai_analysis['top_opportunities'][0]
+                        logger.info(f"📈 Top trending opportunity: {top_trend.get('trend_topic', 'AI-identified trend')}")
+                
+                # Step 2: Generate AI-powered post suggestions (3 options)
+                trending_context = top_trend.get('trend_topic') if top_trend else None
+                ai_posts = self.content_generator.generate_viral_posts(
+                    content_pillar=self._get_hourly_content_pillar(hour),
+                    trending_context=trending_context,
+                    count=3
+                )
+                
+                # Step 3: Get engagement opportunities (RSS feeds + Twitter API)
+                engagement_opportunities = engagement_future.result()
             
             # Use all 3 AI-generated posts, or fallback if none generated
             if not ai_posts:
                 ai_posts = [self._get_fallback_post(), self._get_fallback_post(alternative=True), self._get_fallback_post(alternative=True)]
             
             # Format all posts for email template
-            post_suggestions = []
-            for i, post in enumerate(ai_posts[:3], 1):
-                post_suggestion = {
-                    'option_number': i,
-                    'pillar': post.get('content_pillar', 'educational'),
-                    'framework': post.get('viral_strategy', 'ai-generated'),
-                    'content': post['content'],
-                    'suggested_time': self._get_optimal_posting_time(),
-                    'hashtags': post.get('hashtags', ['#AI', '#SaaS']),
-                    'engagement_strategy': post.get('engagement_strategy', 'Engage with all replies within 1 hour'),
-                    'viral_score': post.get('viral_score', 8.0),
-                    'trending_inspiration': post.get('trending_inspiration', 'Current market trends'),
-                    'viral_potential': post.get('viral_potential', 'High engagement potential'),
-                    'viral_explanation': post.get('viral_explanation', 'Combines actionable insight with authentic personal experience that resonates with entrepreneurs and builders'),
-                    'ai_model': self.config.ai.get_current_provider_config().model_name,
-                    'character_count': post.get('character_count', len(post['content'])),
-                    'is_thread': post.get('is_thread', False),
-                    'thread_count': post.get('thread_count', 1)
-                }
-                post_suggestions.append(post_suggestion)
+            model_name = self.config.ai.get_current_provider_config().model_name
+            post_suggestions = [
+                self._format_post_suggestion(post, i, hour, model_name)
+                for i, post in enumerate(ai_posts[:3], 1)
+            ]
             
-            # Step 3: Get profile-based engagement opportunities
-            # Get engagement opportunities ONLY from RSS feeds + Twitter API (NO web scraping) 
-            engagement_opportunities = []
-            try:
-                # RSS Feed opportunities (primary source for replies)
-                rss_opportunities = self.rss_engagement.discover_engagement_opportunities(max_opportunities=2)
-                for opp in rss_opportunities:
-                    if not self.content_tracker.has_used_rss_post(opp.get('source_username', ''), opp.get('content', '')):
-                        engagement_opportunities.append(opp)
-                
-                # Twitter API viral opportunities (only if we have reads left and from known profiles)
-                if self.api_tracker.can_read() and len(engagement_opportunities) < 2:
-                    try:
-                        viral_opportunities = self.profile_analyzer.get_top_engagement_opportunities(limit=1)
-                        for opp in viral_opportunities:
-                            # Only include if from profiles in our RSS feeds
-                            author_name = opp.get('author_name', '').replace('@', '')
-                            if author_name in ['sama', 'naval', 'AndrewYNg', 'alliekmiller', 'mattshumer_', 'balajis', 'ylecun', 'paulg', 'levelsio']:
-                                engagement_opportunities.append(opp)
-                                self.api_tracker.record_read()
-                    except Exception as e:
-                        logger.warning(f"Twitter API opportunity discovery failed: {e}")
-                
-                logger.info(f"📊 Found {len(engagement_opportunities)} engagement opportunities (RSS + API only)")
-                
-            except Exception as e:
-                logger.warning(f"Engagement opportunity discovery failed: {e}")
-                engagement_opportunities = []
+            # Step 4: Generate contextual AI replies for all engagement opportunities in one call,
+            # reusing cached replies for near-duplicate tweets
+            opportunities_by_id = {f"reply-{i}": opp for i, opp in enumerate(engagement_opportunities)}
+            replies = {}
+            for custom_id, opp in opportunities_by_id.items():
+                cached_reply = self.reply_cache.lookup(opp.get('content', ''))
+                if cached_reply is not None:
+                    replies[custom_id] = cached_reply
             
-            # Step 4: Generate contextual AI replies for each unique engagement opportunity
-            enhanced_opportunities = []
-            used_reply_concepts = set()  # Track reply concepts to ensure uniqueness
+            # One deadline covers both the combined call and the per-tweet fallback
+            reply_deadline = time.monotonic() + _REPLY_TIMEOUT_SECONDS
+            generated = self._generate_replies_combined({
+                custom_id: opp for custom_id, opp in opportunities_by_id.items() if custom_id not in replies
+            }, timeout=_REPLY_TIMEOUT_SECONDS)
+            missing_prompts = {
+                custom_id: self._build_contextual_reply_prompt(opp)
+                for custom_id, opp in opportunities_by_id.items()
+                if custom_id not in replies and custom_id not in generated
+            }
+            remaining = reply_deadline - time.monotonic()
+            if missing_prompts and remaining > 0:
+                # Fall back to one prompt per tweet for anything the combined call didn't answer
+                generated.update(self.content_generator.ai_client.generate_batch(missing_prompts, timeout=remaining))
+            elif missing_prompts:
+                logger.warning(f"Reply time budget spent, skipping fallback for {len(missing_prompts)} opportunities")
+            replies.update(generated)
             
-            for opp in engagement_opportunities:
-                try:
-                    # Generate contextual replies specific to this tweet's content
-                    tweet_content = opp.get('content', '')
-                    author_name = opp.get('author', 'unknown')
-                    
-                    # Create contextual prompt for this specific tweet
-                    contextual_prompt = f"""
-                    Generate 2 unique, contextual replies to this specific tweet by {author_name}:
-                    
-                    Original Tweet: "{tweet_content}"
-                    
-                    Requirements:
-                    - Reply must be SPECIFIC to the content above
-                    - Include personal SaaS/startup experience relevant to their point
-                    - Ask a follow-up question related to their specific message
-                    - Avoid generic responses
-                    - Keep under 280 characters
-                    - Sound like Rakesh Roushan (SaaS expert with practical experience)
-                    
-                    Generate 2 different reply approaches:
-                    1. Personal experience + specific question
-                    2. Contrarian insight + follow-up
-                    """
-                    
-                    # Generate contextual replies instead of generic ones
-                    contextual_replies = self.content_generator.ai_client.generate_content(contextual_prompt)
-                    
-                    if contextual_replies and 'content' in contextual_replies:
-                        # Parse the response to extract multiple replies
-                        reply_text = contextual_replies['content']
-                        
-                        # Store contextual reply information
-                        opp['contextual_reply_prompt'] = contextual_prompt
-                        opp['ai_reply_suggestion'] = reply_text[:280]  # Limit to tweet length
-                        opp['ai_reply_strategy'] = f"Contextual response to {author_name}'s specific content"
-                        opp['reply_viral_score'] = 8.0  # Higher score for contextual content
-                        opp['reply_options'] = [{'content': reply_text[:280], 'viral_score': 8.0}]
-                    else:
-                        # Skip opportunities that can't generate proper contextual replies
-                        logger.warning(f"Skipping {author_name} - unable to generate contextual reply")
-                        continue
-                    
+            enhanced_opportunities = []
+            for custom_id, opp in opportunities_by_id.items():
+                if self._apply_contextual_reply(opp, replies.get(custom_id)):
                     enhanced_opportunities.append(opp)
-                    
-                except Exception as e:
-                    logger.warning(f"Failed to generate contextual reply for {author_name}: {e}")
-                    # Skip opportunities with generation failures instead of using generic fallbacks
-                    continue
+                    if custom_id in generated:
+                        self.reply_cache.store(opp.get('content', ''), generated[custom_id])
             
             # Step 5: Check for duplicate content AND themes before sending
-            email_content_hash = self._generate_email_content_hash(post_suggestions, enhanced_opportunities)
+            email_content_hash = self._generate_email_content_hash(post_suggestions, enhanced_opportunities, current_time)
             main_theme = trending_context if trending_context else top_trend.get('trend_topic', 'general_content') if top_trend else 'general_content'
             
             # Check both exact content and thematic duplicates
             has_content_duplicate = self.content_tracker.has_generated_similar_email(
-                content=str(post_suggestions),
+                content=_dumps_sorted([asdict(post) for post in post_suggestions]),
                 content_type=top_trend.get('trend_topic', 'general') if top_trend else 'general',
                 context=trending_context or ''
             )
@@ -263,11 +341,10 @@ class EmailPipeline:
                     "Business strategy and execution"
                 ]
                 
-                import random
                 alternative_topic = random.choice(alternative_topics)
                 
                 fresh_posts = self.content_generator.generate_viral_posts(
-                    content_pillar=self._get_alternative_content_pillar(),
+                    content_pillar=self._get_alternative_content_pillar(hour),
                     trending_context=alternative_topic,  # Use alternative topic instead
                     count=3,
 
@@ -281,26 +358,10 @@ class EmailPipeline:
                         return True  # Skip entirely if we can't find unique content
                     
                     # Format fresh posts
-                    post_suggestions = []
-                    for i, post in enumerate(fresh_posts[:3], 1):
-                        post_suggestion = {
-                            'option_number': i,
-                            'pillar': post.get('content_pillar', 'educational'),
-                            'framework': post.get('viral_strategy', 'ai-generated'),
-                            'content': post['content'],
-                            'suggested_time': self._get_optimal_posting_time(),
-                            'hashtags': post.get('hashtags', ['#AI', '#SaaS']),
-                            'engagement_strategy': post.get('engagement_strategy', 'Engage with all replies within 1 hour'),
-                            'viral_score': post.get('viral_score', 8.0),
-                            'trending_inspiration': post.get('trending_inspiration', alternative_topic),
-                            'viral_potential': post.get('viral_potential', 'High engagement potential'),
-                            'viral_explanation': post.get('viral_explanation', 'Combines actionable insight with authentic personal experience that resonates with entrepreneurs and builders'),
-                            'ai_model': self.config.ai.get_current_provider_config().model_name,
-                            'character_count': post.get('character_count', len(post['content'])),
-                            'is_thread': post.get('is_thread', False),
-                            'thread_count': post.get('thread_count', 1)
-                        }
-                        post_suggestions.append(post_suggestion)
+                    post_suggestions = [
+                        self._format_post_suggestion(post, i, hour, model_name, trending_inspiration=alternative_topic)
+                        for i, post in enumerate(fresh_posts[:3], 1)
+                    ]
                     
                     # Update the main theme to the alternative
                     main_theme = alternative_theme
@@ -309,12 +370,13 @@ class EmailPipeline:
                     return True
             
             # Step 6: Send enhanced email with AI content (multiple post options)
+            post_dicts = [asdict(post) for post in post_suggestions]
             success = self.smtp_client.send_content_email(
-                post_suggestions, enhanced_opportunities, trends
+                post_dicts, enhanced_opportunities, trends
             )
             
             if success:
-                self.emails_sent_today += 1
+                self._record_email_sent()
                 
                 # Track both content and theme to prevent duplicates
                 self.content_tracker.mark_email_content_generated(email_content_hash)
@@ -323,7 +385,7 @@ class EmailPipeline:
                 logger.info("✅ AI-powered content suggestion email sent successfully")
                 
                 # Log AI insights for analysis
-                self._log_ai_insights(post_suggestions[0] if post_suggestions else {}, enhanced_opportunities, trends)
+                self._log_ai_insights(post_dicts[0] if post_dicts else {}, enhanced_opportunities, trends, current_time)
                 return True
             else:
                 logger.error("❌ Failed to send AI-powered content suggestion email")
@@ -390,6 +452,11 @@ class EmailPipeline:
     
     def _scheduled_email_task(self):
         """Scheduled email task"""
+        # Only send from 6 AM to 11 PM, plus midnight (00:00 = 12 AM)
+        hour = datetime.now(self.ist).hour
+        if not (hour >= 6 or hour == 0):
+            return
+        
         logger.info("📅 Executing scheduled email task")
         
         result = self.send_content_email()
@@ -399,81 +466,222 @@ class EmailPipeline:
         else:
             logger.error("❌ Scheduled email failed")
     
-    def _daily_reset(self):
-        """Reset daily counters"""
-        self.emails_sent_today = 0
-        logger.info("🔄 Daily email counter reset")
+    @property
+    def emails_sent_today(self) -> int:
+        """Emails sent during the current email day"""
+        return self._daily_counts.get(self._email_day(), 0)
     
-    def _get_hourly_content_pillar(self) -> str:
+    def _email_day(self) -> str:
+        """Key for the current email day, which starts at 1 AM IST so the midnight email counts toward the previous day"""
+        return (datetime.now(self.ist) - timedelta(hours=1)).strftime('%Y%m%d')
+    
+    def _load_daily_counts(self) -> Dict[str, int]:
+        """Load persisted daily send counts"""
+        if self.state_file.exists():
+            try:
+                with open(self.state_file, 'r') as f:
+                    return json.load(f).get('daily_counts', {})
+            except Exception as e:
+                logger.warning(f"Failed to load email pipeline state: {e}")
+        return {}
+    
+    def _record_email_sent(self):
+        """Count a sent email for today and persist it, dropping previous days"""
+        day = self._email_day()
+        self._daily_counts = {day: self._daily_counts.get(day, 0) + 1}
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump({'daily_counts': self._daily_counts}, f, indent=2)
+        except Exception as e:
+            logger.error(f"Failed to save email pipeline state: {e}")
+    
+    def _format_post_suggestion(self, post: Dict[str, Any], option_number: int, hour: int, model_name: str,
+                                trending_inspiration: str = 'Current market trends') -> PostSuggestion:
+        """Format a generated post for the email template"""
+        return PostSuggestion(
+            option_number=option_number,
+            pillar=post.get('content_pillar', 'educational'),
+            framework=post.get('viral_strategy', 'ai-generated'),
+            content=post['content'],
+            suggested_time=self._get_optimal_posting_time(hour),
+            hashtags=post.get('hashtags', ['#AI', '#SaaS']),
+            engagement_strategy=post.get('engagement_strategy', 'Engage with all replies within 1 hour'),
+            viral_score=post.get('viral_score', 8.0),
+            trending_inspiration=post.get('trending_inspiration', trending_inspiration),
+            viral_potential=post.get('viral_potential', 'High engagement potential'),
+            viral_explanation=post.get('viral_explanation', 'Combines actionable insight with authentic personal experience that resonates with entrepreneurs and builders'),
+            ai_model=model_name,
+            character_count=post.get('character_count', len(post['content'])),
+            is_thread=post.get('is_thread', False),
+            thread_count=post.get('thread_count', 1)
+        )
+    
+    def _discover_engagement_opportunities(self) -> List[Dict[str, Any]]:
+        """Get engagement opportunities ONLY from RSS feeds + Twitter API (NO web scraping)"""
+        engagement_opportunities = []
+        try:
+            # Fetch RSS and Twitter API opportunities concurrently; both are network-bound
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                # RSS Feed opportunities (primary source for replies)
+                rss_future = executor.submit(self.rss_engagement.discover_engagement_opportunities, max_opportunities=2)
+                
+                # Twitter API viral opportunities (only if we have reads left)
+                viral_future = None
+                if self.api_tracker.can_read():
+                    viral_future = executor.submit(self.profile_analyzer.get_top_engagement_opportunities, count=1)
+                
+                for opp in rss_future.result():
+                    if not self.content_tracker.has_used_rss_post(opp.get('source_username', ''), opp.get('content', '')):
+                        engagement_opportunities.append(opp)
+                
+                # Only use profile opportunities when RSS came up short, and only from known profiles
+                if viral_future is not None and len(engagement_opportunities) < 2:
+                    try:
+                        for opp in viral_future.result():
+                            # Never suggest replies to invented fallback posts
+                            if opp.get('is_mock'):
+                                continue
+                            # Only include if from profiles in our RSS feeds
+                            author_name = opp.get('handle', '').replace('@', '')
+                            if author_name in _RSS_AUTHORS:
+                                # ProfileAnalyzer scrapes RSS mirrors/search, not the Twitter API,
+                                # so this doesn't spend the API read budget
+                                engagement_opportunities.append(opp)
+                    except Exception as e:
+                        logger.warning(f"Twitter API opportunity discovery failed: {e}")
+            
+            logger.info(f"📊 Found {len(engagement_opportunities)} engagement opportunities (RSS + API only)")
+            
+        except Exception as e:
+            logger.warning(f"Engagement opportunity discovery failed: {e}")
+            engagement_opportunities = []
+        
+        return engagement_opportunities
+    
+    def _build_contextual_reply_prompt(self, opp: Dict[str, Any]) -> str:
+        """Create contextual prompt for a specific tweet"""
+        tweet_content = opp.get('content', '')
+        author_name = opp.get('author', 'unknown')
+        
+        return _REPLY_PROMPT_TMPL.substitute(author_name=author_name, tweet_content=tweet_content)
+    
+    def _generate_replies_combined(self, opportunities: Dict[str, Dict[str, Any]],
+                                   timeout: float = _REPLY_TIMEOUT_SECONDS) -> Dict[str, Dict[str, Any]]:
+        """Generate contextual replies for several tweets with a single AI call, keyed by reply id"""
+        if not opportunities:
+            return {}
+        
+        tweets = "\n---\n".join(
+            f"id: {custom_id}\nauthor: {opp.get('author', 'unknown')}\ntweet: \"{opp.get('content', '')}\""
+            for custom_id, opp in opportunities.items()
+        )
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        try:
+            future = executor.submit(
+                self.content_generator.ai_client.generate_content,
+                _BATCH_REPLY_PROMPT_TMPL.substitute(tweets=tweets)
+            )
+            response = future.result(timeout=timeout)
+        except FuturesTimeoutError:
+            logger.warning(f"Combined contextual reply generation timed out after {timeout}s")
+            return {}
+        except Exception as e:
+            logger.warning(f"Combined contextual reply generation failed: {e}")
+            return {}
+        finally:
+            # Don't block on a slow call; a late result is discarded
+            executor.shutdown(wait=False)
+        
+        entries = response.get('replies') if isinstance(response, dict) else None
+        if not isinstance(entries, list):
+            logger.warning("Combined contextual reply response had no replies list")
+            return {}
+        
+        replies = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            custom_id = str(entry.get('id', ''))
+            reply_text = entry.get('reply_1') or entry.get('reply_2')
+            if custom_id in opportunities and isinstance(reply_text, str) and reply_text:
+                replies[custom_id] = {'content': reply_text}
+        
+        return replies
+    
+    def _apply_contextual_reply(self, opp: Dict[str, Any], contextual_replies: Optional[Dict[str, Any]]) -> bool:
+        """Store a generated contextual reply on the opportunity; False if it should be skipped"""
+        author_name = opp.get('author', 'unknown')
+        
+        if contextual_replies and 'content' in contextual_replies:
+            # Parse the response to extract multiple replies
+            reply_text = contextual_replies['content']
+            
+            # Store contextual reply information
+            opp['contextual_reply_prompt'] = self._build_contextual_reply_prompt(opp)
+            opp['ai_reply_suggestion'] = reply_text[:280]  # Limit to tweet length
+            opp['ai_reply_strategy'] = f"Contextual response to {author_name}'s specific content"
+            opp['reply_viral_score'] = 8.0  # Higher score for contextual content
+            opp['reply_options'] = [{'content': reply_text[:280], 'viral_score': 8.0}]
+            return True
+        
+        # Skip opportunities that can't generate proper contextual replies instead of using generic fallbacks
+        logger.warning(f"Skipping {author_name} - unable to generate contextual reply")
+        return False
+    
+    def _get_hourly_content_pillar(self, hour: int) -> str:
         """Get content pillar based on hour for strategic distribution"""
-        current_hour = datetime.now(self.ist).hour
-        
-        # Strategic distribution throughout the day
-        if 6 <= current_hour <= 9:
-            return "educational"  # Morning: Educational content
-        elif 10 <= current_hour <= 14:
-            return "insight"  # Midday: Industry insights
-        elif 15 <= current_hour <= 18:
-            return "personal"  # Afternoon: Personal stories
-        elif 19 <= current_hour <= 21:
-            return "educational"  # Evening: More educational
-        else:
-            return "interactive"  # Late night: Interactive content
+        return _PILLAR_BY_HOUR[hour]
     
-    def _get_optimal_posting_time(self) -> str:
+    def _get_optimal_posting_time(self, hour: int) -> str:
         """Get next optimal posting time based on current hour"""
-        current_hour = datetime.now(self.ist).hour
-        
-        # Peak times for tech/SaaS audience (IST)
-        optimal_times = {
-            6: "9:00 AM IST", 7: "10:00 AM IST", 8: "11:00 AM IST",
-            9: "2:00 PM IST", 10: "2:00 PM IST", 11: "2:00 PM IST",
-            12: "5:00 PM IST", 13: "5:00 PM IST", 14: "5:00 PM IST",
-            15: "7:00 PM IST", 16: "7:00 PM IST", 17: "9:00 PM IST",
-            18: "9:00 PM IST", 19: "Next day 9:00 AM IST",
-            20: "Next day 9:00 AM IST", 21: "Next day 9:00 AM IST",
-            22: "Next day 9:00 AM IST", 23: "Next day 9:00 AM IST"
-        }
-        
-        return optimal_times.get(current_hour, "9:00 AM IST")
+        return _OPTIMAL_TIME_BY_HOUR[hour]
     
     def _get_fallback_post(self, alternative: bool = False) -> Dict[str, Any]:
         """Fallback post if AI generation fails"""
-        
         if alternative:
-            fallback_posts = [
-                {
-                    'content': f'Most {self.config.brand.expertise_areas[0]} leaders focus on features. Winners focus on outcomes. What outcome are you creating today? {self.config.brand.target_hashtags[0]}',
-                    'content_pillar': 'insight',
-                    'viral_score': 7.2,
-                    'hashtags': self.config.brand.target_hashtags[:2],
-                    'engagement_strategy': 'Ask followers to share their outcome-focused strategies',
-                    'ai_model': 'fallback_alt'
-                },
-                {
-                    'content': f'Unpopular opinion: The best {self.config.brand.expertise_areas[0]} decisions are made with 70% of the information. The other 30% comes from execution. {self.config.brand.target_hashtags[0]}',
-                    'content_pillar': 'personal',
-                    'viral_score': 7.0,
-                    'hashtags': self.config.brand.target_hashtags[:2],
-                    'engagement_strategy': 'Ask followers about their decision-making frameworks',
-                    'ai_model': 'fallback_alt2'
-                }
-            ]
-            import random
-            return random.choice(fallback_posts)
+            return self._fallback_alt_posts[random.randrange(len(self._fallback_alt_posts))]
+        return self._fallback_post
+    
+    def _build_fallback_posts(self, brand) -> tuple:
+        """Build the primary and alternative fallback posts for the brand"""
+        expertise = brand.expertise_areas[0]
+        hashtag = brand.target_hashtags[0]
+        hashtags = brand.target_hashtags[:2]
         
-        return {
-            'content': f'The difference between good and great {self.config.brand.expertise_areas[0]}: great ones solve problems customers didn\'t know they had. {self.config.brand.target_hashtags[0]} #ProductStrategy',
+        fallback_post = {
+            'content': f'The difference between good and great {expertise}: great ones solve problems customers didn\'t know they had. {hashtag} #ProductStrategy',
             'content_pillar': 'insight',
             'viral_score': 7.5,
-            'hashtags': self.config.brand.target_hashtags[:2],
+            'hashtags': hashtags,
             'engagement_strategy': 'Ask followers to share their product discovery stories',
             'ai_model': 'fallback'
         }
+        
+        fallback_alt_posts = (
+            {
+                'content': f'Most {expertise} leaders focus on features. Winners focus on outcomes. What outcome are you creating today? {hashtag}',
+                'content_pillar': 'insight',
+                'viral_score': 7.2,
+                'hashtags': hashtags,
+                'engagement_strategy': 'Ask followers to share their outcome-focused strategies',
+                'ai_model': 'fallback_alt'
+            },
+            {
+                'content': f'Unpopular opinion: The best {expertise} decisions are made with 70% of the information. The other 30% comes from execution. {hashtag}',
+                'content_pillar': 'personal',
+                'viral_score': 7.0,
+                'hashtags': hashtags,
+                'engagement_strategy': 'Ask followers about their decision-making frameworks',
+                'ai_model': 'fallback_alt2'
+            }
+        )
+        
+        return fallback_post, fallback_alt_posts
     
-    def _get_alternative_content_pillar(self) -> str:
+    def _get_alternative_content_pillar(self, hour: int) -> str:
         """Get alternative content pillar for fresh content generation"""
-        primary_pillar = self._get_hourly_content_pillar()
+        primary_pillar = self._get_hourly_content_pillar(hour)
         
         # Map to alternative pillars for freshness
         alternatives = {
@@ -485,39 +693,47 @@ class EmailPipeline:
         
         return alternatives.get(primary_pillar, 'educational')
     
-    def _generate_email_content_hash(self, post_suggestions: list, engagement_opportunities: list) -> str:
+    def _generate_email_content_hash(self, post_suggestions: List[PostSuggestion], engagement_opportunities: list,
+                                     current_time: datetime) -> str:
         """Generate hash for email content to detect duplicates"""
-        # Combine key content elements for hashing
-        content_elements = []
+        # Stream key content elements into the hasher instead of joining them first;
+        # \x00 separates fields and \x01 separates records
+        hasher = hashlib.blake2b(digest_size=8)
+        update = hasher.update
         
         # Add detailed post content for better deduplication
         for post in post_suggestions[:3]:  # Only first 3 posts
-            content_elements.append(post.get('content', ''))
-            content_elements.append(str(post.get('viral_score', '')))
-            content_elements.append(post.get('pillar', ''))
+            content, viral_score, pillar = _POST_HASH_FIELDS(post)
+            update(content.lower().encode('utf-8', 'ignore'))
+            update(b'\x00')
+            update(str(viral_score).encode())
+            update(b'\x00')
+            update(pillar.lower().encode('utf-8', 'ignore'))
+            update(b'\x01')
         
         # Add engagement content with more detail
         for opp in engagement_opportunities[:3]:  # Only first 3 opportunities
-            content_elements.append(f"{opp.get('author', '')}: {opp.get('content', '')[:100]}")
-            content_elements.append(opp.get('handle', ''))
+            update(opp.get('author', '').lower().encode('utf-8', 'ignore'))
+            update(b'\x00')
+            update(opp.get('content', '')[:100].lower().encode('utf-8', 'ignore'))
+            update(b'\x00')
+            update(opp.get('handle', '').lower().encode('utf-8', 'ignore'))
+            update(b'\x01')
         
         # Add hour-level timestamp to ensure time-based variance
-        content_elements.append(datetime.now().strftime('%Y-%m-%d-%H'))
-        
-        # Combine all elements
-        combined_content = ' | '.join(content_elements)
+        update(current_time.strftime('%Y-%m-%d-%H').encode())
         
-        # Return the first part of the hash
-        import hashlib
-        return hashlib.md5(combined_content.lower().encode()).hexdigest()[:16]
+        # 8-byte digest keeps the 16 hex character hash length
+        return hasher.hexdigest()
     
     def _log_ai_insights(self, post_suggestion: Dict[str, Any], 
                         engagement_opportunities: List[Dict[str, Any]], 
-                        trends: Dict[str, Any]):
+                        trends: Dict[str, Any],
+                        current_time: datetime):
         """Log AI insights for performance analysis"""
         try:
             insights = {
-                'timestamp': datetime.now(self.ist).isoformat(),
+                'timestamp': current_time.isoformat(),
                 'ai_post_viral_score': post_suggestion.get('viral_score'),
                 'trending_topic': trends.get('ai_analysis', {}).get('top_opportunities', [{}])[0].get('trend_topic') if trends else None,
                 'engagement_count': len(engagement_opportunities),
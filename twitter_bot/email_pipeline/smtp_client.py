@@ -6,6 +6,7 @@ Clean implementation with simple email templates
 
 import smtplib
 import logging
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
@@ -22,8 +23,80 @@ class SMTPClient:
     def __init__(self, config: Config):
         self.config = config
         self.smtp_config = config.email
+        
+        # Persistent authenticated connection, reused across emails
+        self._server: Optional[smtplib.SMTP] = None
+        self._server_lock = threading.Lock()
+        
         logger.info(f"📧 SMTP Client initialized for {self.smtp_config.smtp_host}")
     
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection with proper STARTTLS handling"""
+        server = smtplib.SMTP(self.smtp_config.smtp_host, self.smtp_config.smtp_port, timeout=30)
+        try:
+            server.ehlo()  # Identify ourselves to the server
+            
+            if self.smtp_config.smtp_secure:
+                server.starttls()  # Enable security
+                server.ehlo()  # Re-identify after TLS
+            
+            server.login(self.smtp_config.smtp_user, self.smtp_config.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _disconnect(self):
+        """Drop the persistent connection (caller holds the lock)"""
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+            self._server = None
+    
+    def _send(self, msg: MIMEMultipart):
+        """Send a message over the persistent connection, reconnecting once if it went stale"""
+        with self._server_lock:
+            if self._server is not None:
+                try:
+                    self._server.send_message(msg)
+                    return
+                except smtplib.SMTPServerDisconnected as e:
+                    # The server dropped the idle connection before taking the message; safe to resend
+                    logger.info(f"🔄 SMTP connection went stale ({e}), reconnecting")
+                    self._disconnect()
+                except smtplib.SMTPException:
+                    # The server answered (e.g. a 554 rejection); resending won't help and the
+                    # connection is still usable
+                    raise
+                except OSError:
+                    # The message may already have been accepted (e.g. read timeout after DATA), so
+                    # don't resend; drop the broken socket so the next email starts a fresh connection
+                    self._server.close()
+                    self._server = None
+                    raise
+            
+            self._server = self._connect()
+            self._server.send_message(msg)
+    
+    def keepalive(self):
+        """Send a NOOP so the server doesn't drop the idle connection"""
+        with self._server_lock:
+            if self._server is None:
+                return
+            try:
+                code, _ = self._server.noop()
+                if code != 250:
+                    self._disconnect()
+            except (smtplib.SMTPException, OSError):
+                self._disconnect()
+    
+    def close(self):
+        """Close the persistent SMTP connection"""
+        with self._server_lock:
+            self._disconnect()
+    
     def send_content_email(self, 
                                    post_suggestions: List[Dict[str, Any]], 
                                    engagement_opportunities: List[Dict[str, Any]], 
@@ -50,16 +123,8 @@ class SMTPClient:
             msg.attach(text_part)
             msg.attach(html_part)
             
-            # Send email with proper STARTTLS handling
-            with smtplib.SMTP(self.smtp_config.smtp_host, self.smtp_config.smtp_port) as server:
-                server.ehlo()  # Identify ourselves to the server
-                
-                if self.smtp_config.smtp_secure:
-                    server.starttls()  # Enable security
-                    server.ehlo()  # Re-identify after TLS
-                
-                server.login(self.smtp_config.smtp_user, self.smtp_config.smtp_password)
-                server.send_message(msg)
+            # Send email over the persistent connection
+            self._send(msg)
             
             logger.info(f"✅ Email sent successfully to {self.smtp_config.to_email}")
             return True